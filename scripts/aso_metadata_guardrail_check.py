@@ -12,6 +12,7 @@ import argparse
 import json
 import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from typing import Any, Dict, List, Tuple
 
 APPLE_LIMITS = {
@@ -26,6 +27,14 @@ GOOGLE_LIMITS = {
     "description": 4000,
 }
 
+# Limits are constants, so resolve each (field, limit, message) triple once at import time.
+APPLE_LIMIT_CHECKS = tuple(
+    (field, max_len, f"{field} exceeds Apple limit ({max_len})") for field, max_len in APPLE_LIMITS.items()
+)
+GOOGLE_LIMIT_CHECKS = tuple(
+    (field, max_len, f"{field} exceeds Google Play limit ({max_len})") for field, max_len in GOOGLE_LIMITS.items()
+)
+
 EMOJI_RE = re.compile(
     "["
     "\U0001F300-\U0001F5FF"
@@ -37,15 +46,17 @@ EMOJI_RE = re.compile(
     flags=re.UNICODE,
 )
 
-RANKING_CLAIM_RE = re.compile(r"\b(#\s?1|number\s?1|no\.?\s?1|top\s?1|best)\b", re.IGNORECASE)
-PROMO_RE = re.compile(r"\b(free|discount|sale|deal|%\s?off|limited\s?time)\b", re.IGNORECASE)
-REPEATED_PUNCT_RE = re.compile(r"([!?.])\1{1,}")
+RANKING_CLAIM_RE = re.compile(r"\b(?:#\s?1|number\s?1|no\.?\s?1|top\s?1|best)\b", re.IGNORECASE)
+PROMO_RE = re.compile(r"\b(?:free|discount|sale|deal|%\s?off|limited\s?time)\b", re.IGNORECASE)
+# Only used with search(): one repeat is enough to flag, so no unbounded quantifier is needed.
+REPEATED_PUNCT_RE = re.compile(r"([!?.])\1")
 TOKEN_RE = re.compile(r"[a-z0-9]+")
 
 
 def load_input(path: str) -> List[Dict[str, Any]]:
-    with open(path, "r", encoding="utf-8-sig") as f:
-        payload = json.load(f)
+    # Read raw bytes in one shot; json.loads detects and skips a UTF-8 BOM itself.
+    with open(path, "rb") as f:
+        payload = json.loads(f.read())
     if isinstance(payload, dict):
         return [payload]
     if isinstance(payload, list):
@@ -54,11 +65,15 @@ def load_input(path: str) -> List[Dict[str, Any]]:
 
 
 def text_len(value: Any) -> int:
-    return len(str(value or ""))
+    if not value:
+        return 0
+    return len(value) if type(value) is str else len(str(value))
 
 
 def utf8_len(value: Any) -> int:
-    return len(str(value or "").encode("utf-8"))
+    if not value:
+        return 0
+    return len((value if type(value) is str else str(value)).encode("utf-8"))
 
 
 def repeated_tokens(text: str, threshold: int = 3) -> List[Tuple[str, int]]:
@@ -83,18 +98,18 @@ def contains_competitor_terms(text: str, terms: List[str]) -> List[str]:
 def check_limits(item: Dict[str, Any], errors: List[str]) -> None:
     platform = str(item.get("platform", "")).strip().lower()
     if platform == "apple":
-        for field, max_len in APPLE_LIMITS.items():
-            if text_len(item.get(field, "")) > max_len:
-                errors.append(f"{field} exceeds Apple limit ({max_len})")
+        for field, max_len, message in APPLE_LIMIT_CHECKS:
+            if text_len(item.get(field)) > max_len:
+                errors.append(message)
         keywords = item.get("keywords", "")
         if isinstance(keywords, list):
             keywords = ",".join(str(x) for x in keywords)
         if utf8_len(keywords) > 100:
             errors.append("keywords exceeds Apple 100-byte limit")
     elif platform == "google":
-        for field, max_len in GOOGLE_LIMITS.items():
-            if text_len(item.get(field, "")) > max_len:
-                errors.append(f"{field} exceeds Google Play limit ({max_len})")
+        for field, max_len, message in GOOGLE_LIMIT_CHECKS:
+            if text_len(item.get(field)) > max_len:
+                errors.append(message)
     else:
         errors.append("platform must be 'apple' or 'google'")
 
@@ -134,10 +149,40 @@ def check_risks(item: Dict[str, Any], warnings: List[str]) -> None:
             warnings.append("Competitor terms present: " + ", ".join(found))
 
 
+def process_item(indexed_item: Tuple[int, Dict[str, Any]]) -> Dict[str, Any]:
+    idx, item = indexed_item
+    errors: List[str] = []
+    warnings: List[str] = []
+
+    check_limits(item, errors)
+    check_risks(item, warnings)
+
+    status = "pass"
+    if errors:
+        status = "fail"
+    elif warnings:
+        status = "warn"
+
+    return {
+        "index": idx,
+        "platform": item.get("platform"),
+        "app": item.get("app_name"),
+        "status": status,
+        "errors": errors,
+        "warnings": warnings,
+    }
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(description="Validate ASO metadata guardrails from JSON input")
     parser.add_argument("--input", required=True, help="Path to metadata JSON file")
     parser.add_argument("--output", help="Optional path to write JSON report")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes for per-item checks (default: 1, serial)",
+    )
     args = parser.parse_args()
 
     try:
@@ -148,29 +193,12 @@ def main() -> int:
 
     report: Dict[str, Any] = {"items": [], "summary": {"total": 0, "error_items": 0, "warning_items": 0}}
 
-    for idx, item in enumerate(entries, start=1):
-        errors: List[str] = []
-        warnings: List[str] = []
-
-        check_limits(item, errors)
-        check_risks(item, warnings)
-
-        status = "pass"
-        if errors:
-            status = "fail"
-        elif warnings:
-            status = "warn"
-
-        report["items"].append(
-            {
-                "index": idx,
-                "platform": item.get("platform"),
-                "app": item.get("app_name"),
-                "status": status,
-                "errors": errors,
-                "warnings": warnings,
-            }
-        )
+    indexed = enumerate(entries, start=1)
+    if args.workers > 1 and len(entries) > 1:
+        with ProcessPoolExecutor(max_workers=args.workers) as executor:
+            report["items"] = list(executor.map(process_item, indexed, chunksize=64))
+    else:
+        report["items"] = [process_item(pair) for pair in indexed]
 
     report["summary"]["total"] = len(report["items"])
     report["summary"]["error_items"] = sum(1 for i in report["items"] if i["errors"])
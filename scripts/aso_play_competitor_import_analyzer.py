@@ -10,7 +10,7 @@ Outputs:
 - <prefix>_matrix.csv
 - <prefix>_common_patterns.csv
 - <prefix>_term_coverage.csv
-- <prefix>_similarity.csv
+- <prefix>_similarity.csv (full matrix, or top-K neighbors with --similarity-top-k)
 - <prefix>_semantic_themes.csv
 - <prefix>_keyword_emphasis.csv
 - <prefix>_phrase_patterns.csv
@@ -21,17 +21,22 @@ from __future__ import annotations
 
 import argparse
 import csv
+import heapq
+import io
 import math
+import operator
 import re
-import statistics
 import sys
 from collections import Counter, defaultdict
+from functools import lru_cache, partial
+from itertools import chain
+from multiprocessing import Pool
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Set, Tuple
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
 
 TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+_-]{1,}")
 NUM_RE = re.compile(r"\d")
-EXCLAIM_RE = re.compile(r"!")
+THOUSANDS_SEP_DELETE = str.maketrans("", "", ",")
 
 STOPWORDS = {
     "a",
@@ -131,6 +136,82 @@ SEMANTIC_THEMES = {
     "social_proof": {"millions", "users", "reviews", "rating", "top", "award", "leading"},
 }
 
+
+def index_terms(groups: Dict[str, Set[str]]) -> Dict[str, Tuple[int, Tuple[str, ...]]]:
+    # Map each term to (bitmask of groups containing it, names of those groups).
+    index: Dict[str, Tuple[int, Tuple[str, ...]]] = {}
+    for bit, (group, terms) in enumerate(groups.items()):
+        for term in terms:
+            mask, names = index.get(term, (0, ()))
+            index[term] = (mask | (1 << bit), names + (group,))
+    return index
+
+
+MOTIF_TERM_INDEX = index_terms(MOTIFS)
+THEME_TERM_INDEX = index_terms(SEMANTIC_THEMES)
+
+COMPARATORS = {">=": operator.ge, "<": operator.lt}
+
+# Each rule fires when all of its (motif, comparator, prevalence threshold) conditions hold.
+IMPLICATION_RULES: List[Tuple[Tuple[Tuple[str, str, float], ...], str]] = [
+    (
+        (("ai_positioning", ">=", 0.6),),
+        "AI positioning is saturated. Differentiate with explicit user outcomes.",
+    ),
+    (
+        (("speed_positioning", ">=", 0.5),),
+        "Speed claims are common. Use evidence-backed phrasing.",
+    ),
+    (
+        (("trust_privacy", "<", 0.35),),
+        "Trust/privacy messaging is underused and can be a wedge if product support exists.",
+    ),
+    (
+        (("capture_ingest", ">=", 0.5), ("productivity_outcome", ">=", 0.5)),
+        "Competitors chain capture-to-outcome framing. Preserve this narrative in metadata hierarchy.",
+    ),
+]
+
+COLUMN_CANDIDATES = {
+    "app_name": ["app_name", "title", "name"],
+    "short_description": ["short_description", "short_desc"],
+    "full_description": ["full_description", "description", "long_description"],
+    "developer": ["developer", "seller", "developer_name"],
+    "category": ["category", "primary_genre", "genre"],
+    "locale": ["locale", "language"],
+    "country": ["country", "store_country"],
+    "avg_rating": ["avg_rating", "rating"],
+    "rating_count": ["rating_count", "ratings_count", "user_ratings_total"],
+    "installs": ["installs", "install_count", "downloads"],
+    "price": ["price"],
+    "package_name": ["package_name", "bundle_id", "app_id"],
+    "store_url": ["url", "store_url", "play_url"],
+}
+
+MATRIX_HEADERS = [
+    "app_name",
+    "package_name",
+    "developer",
+    "category",
+    "locale",
+    "country",
+    "price",
+    "avg_rating",
+    "rating_count",
+    "installs",
+    "title_len",
+    "short_description_len",
+    "description_len",
+    "title_has_number",
+    "title_has_exclaim",
+    "title_starts_with_action_verb",
+    "dominant_theme",
+    "top_title_terms",
+    "top_short_terms",
+    "top_description_terms",
+] + list(MOTIFS.keys()) + ["store_url"]
+MATRIX_COLUMN = {header: idx for idx, header in enumerate(MATRIX_HEADERS)}
+
 FIELD_WEIGHTS = {
     "title": 3.0,
     "short_description": 2.0,
@@ -138,55 +219,53 @@ FIELD_WEIGHTS = {
 }
 
 
-def read_csv(path: str) -> List[Dict[str, str]]:
+def iter_csv(path: str) -> Iterator[Dict[str, str]]:
     with open(path, "r", encoding="utf-8-sig", newline="") as f:
-        return list(csv.DictReader(f))
+        yield from csv.DictReader(f)
 
 
-def write_csv(path: Path, rows: List[List[object]]) -> None:
-    with path.open("w", encoding="utf-8", newline="") as f:
-        writer = csv.writer(f)
-        writer.writerows(rows)
+def write_csv(path: Path, rows: Iterable[Sequence[object]]) -> None:
+    # Render the whole table in memory and hand it to the OS in one write.
+    buffer = io.StringIO(newline="")
+    csv.writer(buffer).writerows(rows)
+    path.write_bytes(buffer.getvalue().encode("utf-8"))
 
 
-def tokenize(text: str, min_len: int) -> List[str]:
-    out: List[str] = []
-    for token in TOKEN_RE.findall(text.lower()):
-        if len(token) < min_len:
-            continue
-        if token in STOPWORDS:
-            continue
-        out.append(token)
-    return out
+# Developer, category and localized short descriptions repeat across rows; cache them.
+# Results are tuples so a cached value can never be mutated by a caller.
+@lru_cache(maxsize=8192)
+def tokenize(text: str, min_len: int) -> Tuple[str, ...]:
+    return tuple(
+        [token for token in TOKEN_RE.findall(text.lower()) if len(token) >= min_len and token not in STOPWORDS]
+    )
 
 
 def motif_presence(tokens: Iterable[str]) -> Dict[str, int]:
-    token_set = set(tokens)
-    row: Dict[str, int] = {}
-    for motif, terms in MOTIFS.items():
-        row[motif] = 1 if token_set.intersection(terms) else 0
-    return row
+    mask = 0
+    for token in tokens:
+        entry = MOTIF_TERM_INDEX.get(token)
+        if entry is not None:
+            mask |= entry[0]
+    return {motif: (mask >> bit) & 1 for bit, motif in enumerate(MOTIFS)}
 
 
-def summarize_motifs(rows: List[Dict[str, object]]) -> List[Tuple[str, float, int, int]]:
+def summarize_motifs(rows: List[Tuple[object, ...]]) -> List[Tuple[str, float, int, int]]:
     n = len(rows)
     if n == 0:
         return []
     out: List[Tuple[str, float, int, int]] = []
     for motif in MOTIFS.keys():
-        count = sum(int(r.get(motif, 0)) for r in rows)
+        col = MATRIX_COLUMN[motif]
+        count = sum(int(r[col]) for r in rows)
         prevalence = count / n
         out.append((motif, prevalence, count, n))
     out.sort(key=lambda x: x[1], reverse=True)
     return out
 
 
-def top_document_terms(token_sets: List[Set[str]], top_n: int, min_doc_freq: int) -> List[Tuple[str, int, float]]:
-    n = len(token_sets)
-    df: Counter[str] = Counter()
-    for s in token_sets:
-        for token in s:
-            df[token] += 1
+def top_document_terms(
+    df: Counter[str], n: int, top_n: int, min_doc_freq: int
+) -> List[Tuple[str, int, float]]:
     ranked: List[Tuple[str, int, float]] = []
     for token, count in df.items():
         if count < min_doc_freq:
@@ -197,41 +276,77 @@ def top_document_terms(token_sets: List[Set[str]], top_n: int, min_doc_freq: int
 
 
 def build_similarity(names: List[str], token_sets: List[Set[str]]) -> List[List[str]]:
+    n = len(names)
+    sizes = [len(tokens) for tokens in token_sets]
+    # Jaccard is symmetric with a unit diagonal: fill the upper triangle and mirror it.
+    cells = [["1.000"] * n for _ in range(n)]
+    for i in range(n):
+        a = token_sets[i]
+        size_a = sizes[i]
+        row_i = cells[i]
+        for j in range(i + 1, n):
+            # |a | b| = |a| + |b| - |a & b|, so only the intersection is built.
+            inter = len(a & token_sets[j])
+            denom = size_a + sizes[j] - inter
+            sim = f"{1.0 if denom == 0 else inter / denom:.3f}"
+            row_i[j] = sim
+            cells[j][i] = sim
+
     table: List[List[str]] = []
     table.append(["app"] + names)
+    for name_i, row_i in zip(names, cells):
+        table.append([name_i] + row_i)
+    return table
+
+
+def build_similarity_top_k(names: List[str], token_sets: List[Set[str]], k: int) -> List[List[object]]:
+    # Long-format nearest neighbors: O(n*k) memory instead of an n x n table.
+    n = len(names)
+    sizes = [len(tokens) for tokens in token_sets]
+    heaps: List[List[Tuple[float, int]]] = [[] for _ in range(n)]
+    for i in range(n):
+        a = token_sets[i]
+        size_a = sizes[i]
+        for j in range(i + 1, n):
+            inter = len(a & token_sets[j])
+            denom = size_a + sizes[j] - inter
+            sim = 1.0 if denom == 0 else inter / denom
+            # Negated index makes ties favor the earlier app.
+            for owner, candidate in ((i, (sim, -j)), (j, (sim, -i))):
+                heap = heaps[owner]
+                if len(heap) < k:
+                    heapq.heappush(heap, candidate)
+                elif candidate > heap[0]:
+                    heapq.heapreplace(heap, candidate)
+
+    table: List[List[object]] = [["app", "neighbor", "rank", "similarity"]]
     for i, name_i in enumerate(names):
-        row = [name_i]
-        for j in range(len(names)):
-            a = token_sets[i]
-            b = token_sets[j]
-            denom = len(a.union(b))
-            sim = 1.0 if denom == 0 else len(a.intersection(b)) / denom
-            row.append(f"{sim:.3f}")
-        table.append(row)
+        for rank, (sim, neg_j) in enumerate(sorted(heaps[i], reverse=True), start=1):
+            table.append([name_i, names[-neg_j], rank, f"{sim:.3f}"])
     return table
 
 
 def to_float(value: object, default: float = 0.0) -> float:
+    if value is None:
+        return default
+    # float() tolerates surrounding whitespace and rejects blanks, so only thousands separators need removing.
+    s = (value if type(value) is str else str(value)).translate(THOUSANDS_SEP_DELETE)
     try:
-        if value is None:
-            return default
-        s = str(value).strip().replace(",", "")
-        if not s:
-            return default
         return float(s)
-    except Exception:
+    except ValueError:
         return default
 
 
 def to_int(value: object, default: int = 0) -> int:
+    if value is None:
+        return default
+    s = (value if type(value) is str else str(value)).translate(THOUSANDS_SEP_DELETE)
+    # Plain digit strings that fit a double exactly skip the float round-trip.
+    if len(s) <= 15 and s.isdecimal():
+        return int(s)
     try:
-        if value is None:
-            return default
-        s = str(value).strip().replace(",", "")
-        if not s:
-            return default
         return int(float(s))
-    except Exception:
+    except (ValueError, OverflowError):
         return default
 
 
@@ -291,20 +406,15 @@ def find_col(row: Dict[str, str], candidates: List[str]) -> str:
 def strategic_implications(motif_stats: List[Tuple[str, float, int, int]]) -> List[str]:
     prevalence = {name: p for name, p, _, _ in motif_stats}
     lines: List[str] = []
-    if prevalence.get("ai_positioning", 0.0) >= 0.6:
-        lines.append("AI positioning is saturated. Differentiate with explicit user outcomes.")
-    if prevalence.get("speed_positioning", 0.0) >= 0.5:
-        lines.append("Speed claims are common. Use evidence-backed phrasing.")
-    if prevalence.get("trust_privacy", 0.0) < 0.35:
-        lines.append("Trust/privacy messaging is underused and can be a wedge if product support exists.")
-    if prevalence.get("capture_ingest", 0.0) >= 0.5 and prevalence.get("productivity_outcome", 0.0) >= 0.5:
-        lines.append("Competitors chain capture-to-outcome framing. Preserve this narrative in metadata hierarchy.")
+    for conditions, message in IMPLICATION_RULES:
+        if all(COMPARATORS[op](prevalence.get(motif, 0.0), threshold) for motif, op, threshold in conditions):
+            lines.append(message)
     if not lines:
         lines.append("No highly dominant motif. Split positioning by intent cluster and locale.")
     return lines
 
 
-def top_terms_from_tokens(tokens: List[str], top_n: int = 5) -> List[str]:
+def top_terms_from_tokens(tokens: Sequence[str], top_n: int = 5) -> List[str]:
     if not tokens:
         return []
     return [term for term, _ in Counter(tokens).most_common(top_n)]
@@ -318,7 +428,13 @@ def dominant_theme(theme_hits: Dict[str, int]) -> str:
 
 
 def build_theme_hits(token_set: Set[str]) -> Dict[str, int]:
-    return {theme: len(token_set.intersection(terms)) for theme, terms in SEMANTIC_THEMES.items()}
+    hits = dict.fromkeys(SEMANTIC_THEMES, 0)
+    for token in token_set:
+        entry = THEME_TERM_INDEX.get(token)
+        if entry is not None:
+            for theme in entry[1]:
+                hits[theme] += 1
+    return hits
 
 
 def build_theme_summary(
@@ -338,19 +454,21 @@ def build_theme_summary(
 
 
 def build_keyword_emphasis_rows(
-    keyword_stats: Dict[str, Dict[str, object]],
+    app_counts: Counter[str],
+    title_counts: Counter[str],
+    short_counts: Counter[str],
+    desc_counts: Counter[str],
     total_apps: int,
     min_doc_freq: int,
     top_n: int,
 ) -> List[List[object]]:
     ranked: List[Tuple[str, float, int, int, int, int]] = []
-    for keyword, stats in keyword_stats.items():
-        app_coverage = int(stats.get("apps", 0))
+    for keyword, app_coverage in app_counts.items():
         if app_coverage < min_doc_freq:
             continue
-        title_count = int(stats.get("title", 0))
-        short_count = int(stats.get("short_description", 0))
-        desc_count = int(stats.get("description", 0))
+        title_count = title_counts[keyword]
+        short_count = short_counts[keyword]
+        desc_count = desc_counts[keyword]
         weighted = (
             (title_count * FIELD_WEIGHTS["title"])
             + (short_count * FIELD_WEIGHTS["short_description"])
@@ -389,27 +507,42 @@ def build_keyword_emphasis_rows(
     return rows
 
 
-def make_ngrams(tokens: List[str], n: int) -> List[str]:
-    if len(tokens) < n:
-        return []
-    return [" ".join(tokens[i : i + n]) for i in range(len(tokens) - n + 1)]
+def make_ngrams(tokens: Sequence[str], n: int) -> List[str]:
+    return [" ".join(gram) for gram in zip(*(tokens[i:] for i in range(n)))]
+
+
+def prune_singleton_phrases(
+    phrase_apps: Dict[str, Set[str]],
+    counters: Iterable[Counter[str]],
+) -> None:
+    # Phrases seen in one app so far are the long tail that min_doc_freq (>= 2) drops anyway.
+    singletons = [phrase for phrase, apps in phrase_apps.items() if len(apps) < 2]
+    for phrase in singletons:
+        del phrase_apps[phrase]
+    for counts in counters:
+        for phrase in singletons:
+            counts.pop(phrase, None)
 
 
 def build_phrase_pattern_rows(
-    phrase_stats: Dict[str, Dict[str, object]],
+    phrase_apps: Dict[str, Set[str]],
+    title_counts: Counter[str],
+    short_counts: Counter[str],
+    desc_counts: Counter[str],
     total_apps: int,
     min_doc_freq: int,
     top_n: int,
 ) -> List[List[object]]:
     ranked: List[Tuple[str, float, int, int, int, int, int]] = []
-    for phrase, stats in phrase_stats.items():
-        app_count = len(stats.get("apps", set()))
+    for phrase, apps in phrase_apps.items():
+        app_count = len(apps)
         if app_count < min_doc_freq:
             continue
-        title_mentions = int(stats.get("title_mentions", 0))
-        short_mentions = int(stats.get("short_description_mentions", 0))
-        desc_mentions = int(stats.get("description_mentions", 0))
-        ngram_size = int(stats.get("ngram_size", 2))
+        title_mentions = title_counts[phrase]
+        short_mentions = short_counts[phrase]
+        desc_mentions = desc_counts[phrase]
+        # Tokens never contain spaces, so the n-gram size is recoverable from the phrase.
+        ngram_size = phrase.count(" ") + 1
         weighted = (
             (title_mentions * FIELD_WEIGHTS["title"])
             + (short_mentions * FIELD_WEIGHTS["short_description"])
@@ -450,6 +583,108 @@ def build_phrase_pattern_rows(
     return rows
 
 
+Tokens = Tuple[str, ...]
+RowResult = Tuple[str, str, Tuple[object, ...], Set[str], Set[str], Tokens, Tokens, Tokens, Dict[str, int]]
+
+
+def process_row(row: Dict[str, str], columns: Dict[str, str], min_token_len: int) -> RowResult:
+    # Pure per-row work so it can run in a worker process; cross-row aggregation stays in main().
+    col_app_name = columns["app_name"]
+    col_short = columns["short_description"]
+    col_full = columns["full_description"]
+    col_developer = columns["developer"]
+    col_category = columns["category"]
+    col_locale = columns["locale"]
+    col_country = columns["country"]
+    col_rating = columns["avg_rating"]
+    col_rating_count = columns["rating_count"]
+    col_installs = columns["installs"]
+    col_price = columns["price"]
+    col_pkg = columns["package_name"]
+    col_url = columns["store_url"]
+
+    app_name = str(row.get(col_app_name, "")).strip()
+    short_desc = str(row.get(col_short, "")).strip() if col_short else ""
+    full_desc = str(row.get(col_full, "")).strip() if col_full else ""
+    developer = str(row.get(col_developer, "")).strip() if col_developer else ""
+    category = str(row.get(col_category, "")).strip() if col_category else ""
+    locale = str(row.get(col_locale, "")).strip() if col_locale else ""
+    country = str(row.get(col_country, "")).strip() if col_country else ""
+    rating = to_float(row.get(col_rating)) if col_rating else 0.0
+    rating_count = to_int(row.get(col_rating_count)) if col_rating_count else 0
+    installs = to_int(row.get(col_installs)) if col_installs else 0
+    price = to_float(row.get(col_price)) if col_price else 0.0
+    pkg = str(row.get(col_pkg, "")).strip() if col_pkg else ""
+    url = str(row.get(col_url, "")).strip() if col_url else ""
+
+    # Tokens never span whitespace, so tokenizing each field once and concatenating
+    # matches tokenizing the space-joined text.
+    title_tokens = tokenize(app_name, min_token_len)
+    short_tokens = tokenize(short_desc, min_token_len)
+    desc_tokens = tokenize(full_desc, min_token_len)
+    developer_tokens = tokenize(developer, min_token_len)
+    category_tokens = tokenize(category, min_token_len)
+    tokens = title_tokens + short_tokens + desc_tokens + developer_tokens + category_tokens
+    token_set = set(tokens)
+    motifs = motif_presence(tokens)
+
+    metadata_token_set = set(title_tokens)
+    metadata_token_set.update(short_tokens)
+    metadata_token_set.update(desc_tokens)
+    first_token = title_tokens[0] if title_tokens else ""
+
+    app_theme_hits = build_theme_hits(metadata_token_set)
+
+    # Values in MATRIX_HEADERS order.
+    matrix_row: Tuple[object, ...] = (
+        app_name,
+        pkg,
+        developer,
+        category,
+        locale,
+        country,
+        f"{price:.2f}",
+        f"{rating:.2f}",
+        rating_count,
+        installs,
+        len(app_name),
+        len(short_desc),
+        len(full_desc),
+        1 if NUM_RE.search(app_name) else 0,
+        1 if "!" in app_name else 0,
+        1 if first_token in ACTION_VERBS else 0,
+        dominant_theme(app_theme_hits),
+        ", ".join(top_terms_from_tokens(title_tokens, 4)),
+        ", ".join(top_terms_from_tokens(short_tokens, 5)),
+        ", ".join(top_terms_from_tokens(desc_tokens, 6)),
+    ) + tuple(motifs.values()) + (url,)
+
+    return (
+        app_name,
+        pkg if pkg else app_name,
+        matrix_row,
+        token_set,
+        metadata_token_set,
+        title_tokens,
+        short_tokens,
+        desc_tokens,
+        app_theme_hits,
+    )
+
+
+def iter_row_results(
+    rows: Iterable[Dict[str, str]],
+    process: Callable[[Dict[str, str]], RowResult],
+    workers: int,
+) -> Iterator[RowResult]:
+    # Results are consumed as they arrive so rows never pile up in memory, even with a pool.
+    if workers <= 1:
+        yield from map(process, rows)
+        return
+    with Pool(workers) as pool:
+        yield from pool.imap(process, rows, chunksize=256)
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(description="Build Play competitor analysis matrix from imported CSV data")
     parser.add_argument("--input", required=True, help="Input CSV path for competitor listing data")
@@ -465,6 +700,27 @@ def main() -> int:
         help="Platform scope gate. auto defaults to android_only for Play import pipeline.",
     )
     parser.add_argument("--on-mismatch", choices=["skip", "error"], default="skip")
+    parser.add_argument(
+        "--similarity-top-k",
+        type=int,
+        default=0,
+        help="Write only the K most similar apps per app (long format) instead of the full n x n matrix",
+    )
+    parser.add_argument(
+        "--max-phrases",
+        type=int,
+        default=0,
+        help=(
+            "Bound phrase tracking memory: when more phrases than this are tracked, drop those seen in only "
+            "one app so far. Approximate; a dropped phrase restarts its count if it recurs. 0 disables."
+        ),
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes for per-row tokenization (default: 1, serial)",
+    )
     args = parser.parse_args()
 
     output_dir = Path(args.output_dir)
@@ -480,142 +736,89 @@ def main() -> int:
         write_skipped_outputs(output_dir=output_dir, prefix=args.prefix, app_scope=app_scope, reason=reason)
         return 0
 
+    # Stream rows so raw CSV text is dropped as soon as each row is processed.
     try:
-        rows = read_csv(args.input)
+        row_iter = iter_csv(args.input)
+        first = next(row_iter, None)
     except Exception as exc:
         print(f"ERROR: failed to read input csv: {exc}")
         return 2
 
-    if not rows:
+    if first is None:
         print("ERROR: input csv is empty")
         return 2
 
-    first = rows[0]
-    col_app_name = find_col(first, ["app_name", "title", "name"])
-    col_short = find_col(first, ["short_description", "short_desc"])
-    col_full = find_col(first, ["full_description", "description", "long_description"])
-    col_developer = find_col(first, ["developer", "seller", "developer_name"])
-    col_category = find_col(first, ["category", "primary_genre", "genre"])
-    col_locale = find_col(first, ["locale", "language"])
-    col_country = find_col(first, ["country", "store_country"])
-    col_rating = find_col(first, ["avg_rating", "rating"])
-    col_rating_count = find_col(first, ["rating_count", "ratings_count", "user_ratings_total"])
-    col_installs = find_col(first, ["installs", "install_count", "downloads"])
-    col_price = find_col(first, ["price"])
-    col_pkg = find_col(first, ["package_name", "bundle_id", "app_id"])
-    col_url = find_col(first, ["url", "store_url", "play_url"])
-
-    if not col_app_name:
+    rows = chain([first], row_iter)
+    columns = {field: find_col(first, candidates) for field, candidates in COLUMN_CANDIDATES.items()}
+
+    if not columns["app_name"]:
         print("ERROR: could not find app name column (expected app_name/title/name)")
         return 2
 
-    matrix_rows: List[Dict[str, object]] = []
+    matrix_rows: List[Tuple[object, ...]] = []
     token_sets: List[Set[str]] = []
+    term_doc_counts: Counter[str] = Counter()
     names: List[str] = []
 
     theme_app_counts: Counter[str] = Counter()
     theme_terms: Dict[str, Counter[str]] = defaultdict(Counter)
     theme_examples: Dict[str, List[str]] = defaultdict(list)
-    keyword_stats: Dict[str, Dict[str, object]] = defaultdict(
-        lambda: {"apps": 0, "title": 0, "short_description": 0, "description": 0}
-    )
-    phrase_stats: Dict[str, Dict[str, object]] = defaultdict(
-        lambda: {
-            "apps": set(),
-            "title_mentions": 0,
-            "short_description_mentions": 0,
-            "description_mentions": 0,
-            "ngram_size": 2,
-        }
-    )
-
-    for row in rows:
-        app_name = str(row.get(col_app_name, "")).strip()
-        short_desc = str(row.get(col_short, "")).strip() if col_short else ""
-        full_desc = str(row.get(col_full, "")).strip() if col_full else ""
-        developer = str(row.get(col_developer, "")).strip() if col_developer else ""
-        category = str(row.get(col_category, "")).strip() if col_category else ""
-        locale = str(row.get(col_locale, "")).strip() if col_locale else ""
-        country = str(row.get(col_country, "")).strip() if col_country else ""
-        rating = to_float(row.get(col_rating)) if col_rating else 0.0
-        rating_count = to_int(row.get(col_rating_count)) if col_rating_count else 0
-        installs = to_int(row.get(col_installs)) if col_installs else 0
-        price = to_float(row.get(col_price)) if col_price else 0.0
-        pkg = str(row.get(col_pkg, "")).strip() if col_pkg else ""
-        url = str(row.get(col_url, "")).strip() if col_url else ""
-
-        text = " ".join([app_name, short_desc, full_desc, developer, category])
-        tokens = tokenize(text, args.min_token_len)
-        token_set = set(tokens)
-        motifs = motif_presence(tokens)
-
-        title_tokens = tokenize(app_name, args.min_token_len)
-        short_tokens = tokenize(short_desc, args.min_token_len)
-        desc_tokens = tokenize(full_desc, args.min_token_len)
-        metadata_token_set = set(title_tokens).union(short_tokens).union(desc_tokens)
-        first_token = title_tokens[0] if title_tokens else ""
-
-        app_theme_hits = build_theme_hits(metadata_token_set)
-        app_dominant_theme = dominant_theme(app_theme_hits)
-        for theme, hit_count in app_theme_hits.items():
-            if hit_count <= 0:
-                continue
-            theme_app_counts[theme] += 1
-            theme_terms[theme].update([t for t in metadata_token_set if t in SEMANTIC_THEMES[theme]])
-            if app_name and len(theme_examples[theme]) < 5 and app_name not in theme_examples[theme]:
-                theme_examples[theme].append(app_name)
-
-        for token in metadata_token_set:
-            keyword_stats[token]["apps"] = int(keyword_stats[token]["apps"]) + 1
-        for token in set(title_tokens):
-            keyword_stats[token]["title"] = int(keyword_stats[token]["title"]) + 1
-        for token in set(short_tokens):
-            keyword_stats[token]["short_description"] = int(keyword_stats[token]["short_description"]) + 1
-        for token in set(desc_tokens):
-            keyword_stats[token]["description"] = int(keyword_stats[token]["description"]) + 1
-
-        app_key = pkg if pkg else app_name
-        for n in (2, 3):
-            for phrase in set(make_ngrams(title_tokens, n)):
-                phrase_stats[phrase]["ngram_size"] = n
-                phrase_stats[phrase]["title_mentions"] = int(phrase_stats[phrase]["title_mentions"]) + 1
-                phrase_stats[phrase]["apps"].add(app_key)
-            for phrase in set(make_ngrams(short_tokens, n)):
-                phrase_stats[phrase]["ngram_size"] = n
-                phrase_stats[phrase]["short_description_mentions"] = int(phrase_stats[phrase]["short_description_mentions"]) + 1
-                phrase_stats[phrase]["apps"].add(app_key)
-            for phrase in set(make_ngrams(desc_tokens, n)):
-                phrase_stats[phrase]["ngram_size"] = n
-                phrase_stats[phrase]["description_mentions"] = int(phrase_stats[phrase]["description_mentions"]) + 1
-                phrase_stats[phrase]["apps"].add(app_key)
-
-        matrix_row: Dict[str, object] = {
-            "app_name": app_name,
-            "package_name": pkg,
-            "developer": developer,
-            "category": category,
-            "locale": locale,
-            "country": country,
-            "price": f"{price:.2f}",
-            "avg_rating": f"{rating:.2f}",
-            "rating_count": rating_count,
-            "installs": installs,
-            "title_len": len(app_name),
-            "short_description_len": len(short_desc),
-            "description_len": len(full_desc),
-            "title_has_number": 1 if NUM_RE.search(app_name) else 0,
-            "title_has_exclaim": 1 if EXCLAIM_RE.search(app_name) else 0,
-            "title_starts_with_action_verb": 1 if first_token in ACTION_VERBS else 0,
-            "dominant_theme": app_dominant_theme,
-            "top_title_terms": ", ".join(top_terms_from_tokens(title_tokens, 4)),
-            "top_short_terms": ", ".join(top_terms_from_tokens(short_tokens, 5)),
-            "top_description_terms": ", ".join(top_terms_from_tokens(desc_tokens, 6)),
-            "store_url": url,
-        }
-        matrix_row.update(motifs)
-        matrix_rows.append(matrix_row)
-        token_sets.append(token_set)
-        names.append(app_name)
+    keyword_app_counts: Counter[str] = Counter()
+    keyword_title_counts: Counter[str] = Counter()
+    keyword_short_counts: Counter[str] = Counter()
+    keyword_desc_counts: Counter[str] = Counter()
+    phrase_apps: Dict[str, Set[str]] = defaultdict(set)
+    phrase_title_counts: Counter[str] = Counter()
+    phrase_short_counts: Counter[str] = Counter()
+    phrase_desc_counts: Counter[str] = Counter()
+    prune_phrases_above = max(args.max_phrases, 0)
+
+    process = partial(process_row, columns=columns, min_token_len=args.min_token_len)
+    try:
+        for (
+            app_name,
+            app_key,
+            matrix_row,
+            token_set,
+            metadata_token_set,
+            title_tokens,
+            short_tokens,
+            desc_tokens,
+            app_theme_hits,
+        ) in iter_row_results(rows, process, args.workers):
+            for theme, hit_count in app_theme_hits.items():
+                if hit_count <= 0:
+                    continue
+                theme_app_counts[theme] += 1
+                theme_terms[theme].update([t for t in metadata_token_set if t in SEMANTIC_THEMES[theme]])
+                if app_name and len(theme_examples[theme]) < 5 and app_name not in theme_examples[theme]:
+                    theme_examples[theme].append(app_name)
+
+            keyword_app_counts.update(metadata_token_set)
+            for tokens, keyword_counts, phrase_counts in (
+                (title_tokens, keyword_title_counts, phrase_title_counts),
+                (short_tokens, keyword_short_counts, phrase_short_counts),
+                (desc_tokens, keyword_desc_counts, phrase_desc_counts),
+            ):
+                keyword_counts.update(set(tokens))
+                # Bigrams and trigrams never collide (different word counts), so one set holds both.
+                phrases = set(make_ngrams(tokens, 2))
+                phrases.update(make_ngrams(tokens, 3))
+                phrase_counts.update(phrases)
+                for phrase in phrases:
+                    phrase_apps[phrase].add(app_key)
+            if prune_phrases_above and len(phrase_apps) > prune_phrases_above:
+                prune_singleton_phrases(phrase_apps, (phrase_title_counts, phrase_short_counts, phrase_desc_counts))
+                # If most survivors are shared phrases, back off instead of re-pruning on every row.
+                prune_phrases_above = max(args.max_phrases, 2 * len(phrase_apps))
+
+            matrix_rows.append(matrix_row)
+            token_sets.append(token_set)
+            term_doc_counts.update(token_set)
+            names.append(app_name)
+    except (csv.Error, UnicodeDecodeError) as exc:
+        print(f"ERROR: failed to read input csv: {exc}")
+        return 2
 
     if not matrix_rows:
         print("ERROR: no competitor rows processed")
@@ -623,38 +826,33 @@ def main() -> int:
 
     motif_stats = summarize_motifs(matrix_rows)
     min_doc_freq = max(2, int(math.ceil(len(token_sets) * args.common_threshold)))
-    top_terms = top_document_terms(token_sets, args.top_terms, min_doc_freq)
-    similarity_table = build_similarity(names, token_sets)
+    top_terms = top_document_terms(term_doc_counts, len(token_sets), args.top_terms, min_doc_freq)
+    if args.similarity_top_k > 0:
+        similarity_table = build_similarity_top_k(names, token_sets, args.similarity_top_k)
+    else:
+        similarity_table = build_similarity(names, token_sets)
     semantic_theme_csv = build_theme_summary(theme_app_counts, theme_terms, theme_examples, len(matrix_rows))
-    keyword_emphasis_csv = build_keyword_emphasis_rows(keyword_stats, len(matrix_rows), min_doc_freq, args.top_terms)
-    phrase_patterns_csv = build_phrase_pattern_rows(phrase_stats, len(matrix_rows), min_doc_freq, args.top_terms)
-
-    matrix_headers = [
-        "app_name",
-        "package_name",
-        "developer",
-        "category",
-        "locale",
-        "country",
-        "price",
-        "avg_rating",
-        "rating_count",
-        "installs",
-        "title_len",
-        "short_description_len",
-        "description_len",
-        "title_has_number",
-        "title_has_exclaim",
-        "title_starts_with_action_verb",
-        "dominant_theme",
-        "top_title_terms",
-        "top_short_terms",
-        "top_description_terms",
-    ] + list(MOTIFS.keys()) + ["store_url"]
-
-    matrix_csv: List[List[object]] = [matrix_headers]
-    for row in matrix_rows:
-        matrix_csv.append([row.get(h, "") for h in matrix_headers])
+    keyword_emphasis_csv = build_keyword_emphasis_rows(
+        keyword_app_counts,
+        keyword_title_counts,
+        keyword_short_counts,
+        keyword_desc_counts,
+        len(matrix_rows),
+        min_doc_freq,
+        args.top_terms,
+    )
+    phrase_patterns_csv = build_phrase_pattern_rows(
+        phrase_apps,
+        phrase_title_counts,
+        phrase_short_counts,
+        phrase_desc_counts,
+        len(matrix_rows),
+        min_doc_freq,
+        args.top_terms,
+    )
+
+    matrix_csv: List[Sequence[object]] = [MATRIX_HEADERS]
+    matrix_csv.extend(matrix_rows)
 
     common_patterns_csv = [["motif", "prevalence", "count", "total", "is_common"]]
     for motif, prevalence, count, total in motif_stats:
@@ -683,9 +881,13 @@ def main() -> int:
     write_csv(emphasis_path, keyword_emphasis_csv)
     write_csv(phrases_path, phrase_patterns_csv)
 
-    title_lengths = [int(r["title_len"]) for r in matrix_rows]
-    short_lengths = [int(r["short_description_len"]) for r in matrix_rows]
-    desc_lengths = [int(r["description_len"]) for r in matrix_rows]
+    title_col = MATRIX_COLUMN["title_len"]
+    short_col = MATRIX_COLUMN["short_description_len"]
+    desc_col = MATRIX_COLUMN["description_len"]
+    total_apps = len(matrix_rows)
+    avg_title_len = sum(int(r[title_col]) for r in matrix_rows) / total_apps
+    avg_short_len = sum(int(r[short_col]) for r in matrix_rows) / total_apps
+    avg_desc_len = sum(int(r[desc_col]) for r in matrix_rows) / total_apps
     implications = strategic_implications(motif_stats)
 
     report_lines = [
@@ -698,9 +900,9 @@ def main() -> int:
         f"- Common-pattern threshold: `{args.common_threshold:.2f}`",
         "",
         "## Structural Metadata Patterns",
-        f"- Avg title length: `{statistics.mean(title_lengths):.1f}`",
-        f"- Avg short description length: `{statistics.mean(short_lengths):.1f}`",
-        f"- Avg full description length: `{statistics.mean(desc_lengths):.1f}`",
+        f"- Avg title length: `{avg_title_len:.1f}`",
+        f"- Avg short description length: `{avg_short_len:.1f}`",
+        f"- Avg full description length: `{avg_desc_len:.1f}`",
         "",
         "## Shared Motif Prevalence",
     ]
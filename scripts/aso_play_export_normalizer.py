@@ -9,9 +9,12 @@ from __future__ import annotations
 import argparse
 import csv
 import json
+import os
 import re
 import sys
-from typing import Dict, List, Optional
+from functools import lru_cache
+from itertools import chain
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 
 TARGET_COLUMNS = [
     "app_name",
@@ -45,50 +48,61 @@ ALIASES = {
     "url": ["url", "store_url", "play_url", "listing_url", "app_url"],
 }
 
+NUMERIC_TARGETS = {"avg_rating", "rating_count", "installs", "price"}
+HEADER_SEPARATOR_RE = re.compile(r"[^a-z0-9]+")
 
+
+@lru_cache(maxsize=2048)
 def normalize_header(value: str) -> str:
-    return re.sub(r"[^a-z0-9]+", "_", str(value or "").strip().lower()).strip("_")
+    return HEADER_SEPARATOR_RE.sub("_", str(value or "").strip().lower()).strip("_")
+
+
+# Aliases are normalized once at import; build_mapping only normalizes the input headers.
+ALIAS_KEYS = {target: [normalize_header(c) for c in candidates] for target, candidates in ALIASES.items()}
 
 
-def read_csv(path: str) -> List[Dict[str, str]]:
+def iter_csv(path: str) -> Iterator[List[str]]:
     with open(path, "r", encoding="utf-8-sig", newline="") as f:
-        return list(csv.DictReader(f))
+        for row in csv.reader(f):
+            # Skip blank lines the same way csv.DictReader does.
+            if row:
+                yield row
 
 
-def pick_source_column(headers: List[str], candidates: List[str]) -> Optional[str]:
-    normalized_map = {normalize_header(h): h for h in headers}
-    for c in candidates:
-        key = normalize_header(c)
+def pick_source_column(normalized_map: Dict[str, str], candidate_keys: List[str]) -> Optional[str]:
+    for key in candidate_keys:
         if key in normalized_map:
             return normalized_map[key]
     return None
 
 
 def build_mapping(headers: List[str], override: Dict[str, str]) -> Dict[str, str]:
+    normalized_map = {normalize_header(h): h for h in headers}
     mapping: Dict[str, str] = {}
     for target in TARGET_COLUMNS:
         if target in override and override[target]:
             mapping[target] = override[target]
             continue
-        source = pick_source_column(headers, ALIASES.get(target, [target]))
+        source = pick_source_column(normalized_map, ALIAS_KEYS.get(target, [normalize_header(target)]))
         if source:
             mapping[target] = source
     return mapping
 
 
+def source_indices(header_row: List[str], mapping: Dict[str, str]) -> List[Tuple[str, int]]:
+    # Duplicate header names resolve to their last column, as csv.DictReader would.
+    column_index = {name: idx for idx, name in enumerate(header_row)}
+    return [(target, column_index.get(mapping.get(target, ""), -1)) for target in TARGET_COLUMNS]
+
+
 def clean_numeric(value: str) -> str:
-    s = str(value or "").strip()
-    if not s:
-        return ""
-    s = s.replace(",", "")
-    return s
+    # csv.reader always yields str, so skip the coercion; replace() returns the same object when there is no comma.
+    return value.strip().replace(",", "")
 
 
-def normalize_value(target: str, value: str) -> str:
-    raw = str(value or "").strip()
-    if target in {"avg_rating", "rating_count", "installs", "price"}:
-        return clean_numeric(raw)
-    return raw
+def column_cleaners(target_indices: List[Tuple[str, int]]) -> List[Tuple[int, Callable[[str], str]]]:
+    # Resolve each output column's cleaner once so the row loop does no per-cell target checks.
+    return [(idx, clean_numeric if target in NUMERIC_TARGETS else str.strip) for target, idx in target_indices]
 
 
 def load_override_mapping(path: Optional[str]) -> Dict[str, str]:
@@ -114,17 +128,20 @@ def main() -> int:
     parser.add_argument("--print-columns", action="store_true", help="Print detected input columns and mapping")
     args = parser.parse_args()
 
+    # Peek the header and first row, then stream the rest straight to the output.
     try:
-        rows = read_csv(args.input)
+        row_iter = iter_csv(args.input)
+        header_row = next(row_iter, None)
+        first = next(row_iter, None)
     except Exception as exc:
         print(f"ERROR: failed to read input csv: {exc}")
         return 2
 
-    if not rows:
+    if header_row is None or first is None:
         print("ERROR: input csv is empty")
         return 2
 
-    headers = list(rows[0].keys())
+    headers = list(dict.fromkeys(header_row))
 
     try:
         override = load_override_mapping(args.mapping_json)
@@ -140,20 +157,23 @@ def main() -> int:
         print("ERROR: missing required mapped columns: " + ", ".join(missing_core))
         return 2
 
-    output_rows: List[Dict[str, str]] = []
-    for row in rows:
-        out: Dict[str, str] = {}
-        for target in TARGET_COLUMNS:
-            source_col = mapping.get(target, "")
-            value = row.get(source_col, "") if source_col else ""
-            out[target] = normalize_value(target, value)
-        output_rows.append(out)
-
-    with open(args.output, "w", encoding="utf-8", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=TARGET_COLUMNS)
-        writer.writeheader()
-        for row in output_rows:
-            writer.writerow(row)
+    cleaners = column_cleaners(source_indices(header_row, mapping))
+    row_count = 0
+    # Stream into a sibling temp file so a read error never leaves a truncated --output behind.
+    tmp_output = args.output + ".tmp"
+    try:
+        with open(tmp_output, "w", encoding="utf-8", newline="", buffering=1 << 20) as f:
+            writer = csv.writer(f)
+            writer.writerow(TARGET_COLUMNS)
+            for row in chain([first], row_iter):
+                width = len(row)
+                writer.writerow([clean(row[idx]) if 0 <= idx < width else "" for idx, clean in cleaners])
+                row_count += 1
+    except (csv.Error, UnicodeDecodeError) as exc:
+        os.remove(tmp_output)
+        print(f"ERROR: failed to read input csv: {exc}")
+        return 2
+    os.replace(tmp_output, args.output)
 
     if args.print_columns:
         print("INPUT_COLUMNS:")
@@ -164,7 +184,7 @@ def main() -> int:
             print(f"- {t}: {mapping.get(t, '')}")
 
     print(f"Wrote normalized csv: {args.output}")
-    print(f"Rows: {len(output_rows)}")
+    print(f"Rows: {row_count}")
     if missing_core:
         print("WARNING: missing core mapped columns: " + ", ".join(missing_core))
     return 0
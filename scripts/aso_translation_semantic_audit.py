@@ -9,7 +9,7 @@ import argparse
 import json
 import re
 import sys
-from typing import Any, Dict, List, Set
+from typing import Any, Dict, List, Set, Tuple
 
 APPLE_LIMITS = {
     "title": 30,
@@ -23,12 +23,13 @@ GOOGLE_LIMITS = {
     "description": 4000,
 }
 
-PLACEHOLDER_RE = re.compile(r"(\{[a-zA-Z0-9_]+\}|\{\{[a-zA-Z0-9_]+\}\}|%[sd])")
 NUMBER_RE = re.compile(r"\d+")
+# One pass for both placeholders and digit runs; digits inside a placeholder are re-extracted from the match.
+PLACEHOLDER_OR_NUMBER_RE = re.compile(r"(\{[a-zA-Z0-9_]+\}|\{\{[a-zA-Z0-9_]+\}\}|%[sd])|\d+")
 ALPHA_RE = re.compile(r"[A-Za-z]{4,}")
 WORD_RE = re.compile(r"[A-Za-z]{3,}")
 
-COMMON_ENGLISH_WORDS = {
+COMMON_ENGLISH_WORDS = frozenset({
     "the",
     "and",
     "for",
@@ -54,7 +55,7 @@ COMMON_ENGLISH_WORDS = {
     "improve",
     "progress",
     "analytics",
-}
+})
 
 
 def load_payload(path: str) -> Dict[str, Any]:
@@ -73,12 +74,18 @@ def get_limit(platform: str, field: str) -> int:
     return 999999
 
 
-def placeholders(text: str) -> Set[str]:
-    return set(PLACEHOLDER_RE.findall(text))
-
-
-def numbers(text: str) -> List[str]:
-    return NUMBER_RE.findall(text)
+def placeholders_and_numbers(text: str) -> Tuple[Set[str], List[str]]:
+    found_placeholders: Set[str] = set()
+    found_numbers: List[str] = []
+    for match in PLACEHOLDER_OR_NUMBER_RE.finditer(text):
+        placeholder = match.group(1)
+        if placeholder is None:
+            found_numbers.append(match.group())
+        else:
+            found_placeholders.add(placeholder)
+            if placeholder[0] == "{":
+                found_numbers.extend(NUMBER_RE.findall(placeholder))
+    return found_placeholders, found_numbers
 
 
 def words(text: str) -> List[str]:
@@ -91,6 +98,11 @@ def main() -> int:
     parser.add_argument("--platform", choices=["apple", "google"], default="apple")
     parser.add_argument("--output", help="Optional output JSON report path")
     parser.add_argument("--fail-on-warn", action="store_true", help="Return non-zero when warnings exist")
+    parser.add_argument(
+        "--print-report",
+        action="store_true",
+        help="Print the full JSON report to stdout even when --output is set",
+    )
     args = parser.parse_args()
 
     try:
@@ -120,84 +132,104 @@ def main() -> int:
         entry_id = str(entry.get("id", ""))
         field = str(entry.get("field", ""))
         source_text = str(entry.get("source_text", ""))
-        source_placeholders = placeholders(source_text)
-        source_numbers = numbers(source_text)
         translations = entry.get("translations", {})
 
         if not isinstance(translations, dict):
             continue
 
+        # Source-side checks are identical for every locale, so compute them once per entry.
+        source_placeholders, source_numbers = placeholders_and_numbers(source_text)
+        source_has_alpha = ALPHA_RE.search(source_text) is not None
+        source_word_list = words(source_text)
+        source_words = set(source_word_list)
+        limit = get_limit(args.platform, field)
+        source_terms = [term for term in protected_terms if term and term in source_text]
+
         for locale in target_locales:
             target = str(translations.get(locale, "")).strip()
             loc_report = report["locale_report"][locale]
+            errs = loc_report["errors"]
+            warns = loc_report["warnings"]
 
             if not target:
-                loc_report["errors"].append(f"{entry_id}: missing translation")
+                errs.append(f"{entry_id}: missing translation")
                 continue
 
-            limit = get_limit(args.platform, field)
             if len(target) > limit:
-                loc_report["errors"].append(
+                errs.append(
                     f"{entry_id}: {field} exceeds {args.platform} limit ({len(target)}/{limit})"
                 )
 
-            target_placeholders = placeholders(target)
-            if source_placeholders != target_placeholders:
-                loc_report["errors"].append(
-                    f"{entry_id}: placeholder mismatch source={sorted(source_placeholders)} target={sorted(target_placeholders)}"
-                )
+            # An untranslated copy trivially passes the placeholder, number and protected-term checks.
+            identical = target == source_text
+            if not identical:
+                target_placeholders, target_numbers = placeholders_and_numbers(target)
+                if source_placeholders != target_placeholders:
+                    errs.append(
+                        f"{entry_id}: placeholder mismatch source={sorted(source_placeholders)} target={sorted(target_placeholders)}"
+                    )
 
-            target_numbers = numbers(target)
-            if source_numbers != target_numbers:
-                loc_report["warnings"].append(
-                    f"{entry_id}: numeric token mismatch source={source_numbers} target={target_numbers}"
-                )
+                if source_numbers != target_numbers:
+                    warns.append(
+                        f"{entry_id}: numeric token mismatch source={source_numbers} target={target_numbers}"
+                    )
 
             # If source has substantial alphabetic text and target equals source, likely untranslated.
-            if target == source_text and ALPHA_RE.search(source_text):
-                loc_report["warnings"].append(f"{entry_id}: translation identical to source text")
+            if source_has_alpha and identical:
+                warns.append(f"{entry_id}: translation identical to source text")
 
             # Literal translation risk: excessively high lexical overlap with source in non-English locales.
             if not locale.lower().startswith("en"):
-                source_words = set(words(source_text))
-                target_words = set(words(target))
+                # Scan the target for words once; the overlap and English-ratio checks share it.
+                target_word_list = source_word_list if identical else words(target)
                 if source_words:
+                    target_words = source_words if identical else set(target_word_list)
                     overlap = len(source_words.intersection(target_words)) / max(1, len(source_words))
                     if overlap >= 0.85:
-                        loc_report["warnings"].append(
+                        warns.append(
                             f"{entry_id}: high source-target lexical overlap ({overlap:.2f}), possible literal translation"
                         )
 
                 # Cultural adaptation risk proxy: target copy remains heavily English.
-                target_word_list = words(target)
                 if target_word_list:
-                    english_hits = sum(1 for w in target_word_list if w in COMMON_ENGLISH_WORDS)
+                    english_hits = sum(map(COMMON_ENGLISH_WORDS.__contains__, target_word_list))
                     english_ratio = english_hits / len(target_word_list)
                     if english_ratio >= 0.40:
-                        loc_report["warnings"].append(
+                        warns.append(
                             f"{entry_id}: high English word ratio ({english_ratio:.2f}) for locale {locale}"
                         )
 
-            for term in protected_terms:
-                if term and term in source_text and term not in target:
-                    loc_report["warnings"].append(f"{entry_id}: protected term '{term}' missing")
+            if not identical:
+                for term in source_terms:
+                    if term not in target:
+                        warns.append(f"{entry_id}: protected term '{term}' missing")
 
     for locale in target_locales:
         loc_report = report["locale_report"][locale]
         report["summary"]["warnings"] += len(loc_report["warnings"])
         report["summary"]["errors"] += len(loc_report["errors"])
 
-    output = json.dumps(report, ensure_ascii=False, indent=2)
-
-    if args.output:
+    summary = report["summary"]
+    if args.output and not args.print_report:
+        # Stream straight to the file; stdout only gets a one-line summary.
         with open(args.output, "w", encoding="utf-8") as f:
-            f.write(output + "\n")
-
-    print(output)
-
-    if report["summary"]["errors"] > 0:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        print(f"Wrote QA report: {args.output}")
+        print(
+            f"Summary: entries={summary['entries']} locales={summary['locales']} "
+            f"warnings={summary['warnings']} errors={summary['errors']}"
+        )
+    else:
+        output = json.dumps(report, ensure_ascii=False, indent=2)
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                f.write(output + "\n")
+        print(output)
+
+    if summary["errors"] > 0:
         return 1
-    if args.fail_on_warn and report["summary"]["warnings"] > 0:
+    if args.fail_on_warn and summary["warnings"] > 0:
         return 1
     return 0
 
@@ -11,13 +11,19 @@ Supports:
 from __future__ import annotations
 
 import argparse
+import http.client
 import json
+import queue
+import re
+import string
 import subprocess
 import sys
 import time
 import urllib.parse
 import urllib.request
-from typing import Any, Dict, List
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Dict, List, Optional, Tuple
 
 
 def load_payload(path: str) -> Dict[str, Any]:
@@ -43,9 +49,30 @@ def translate_command(template: str, source_locale: str, target_locale: str, tex
     return proc.stdout.strip()
 
 
-def translate_libre(endpoint: str, api_key: str, source_locale: str, target_locale: str, text: str) -> str:
-    payload = {
-        "q": text,
+def open_libre_connection(endpoint: str) -> Tuple[Optional[http.client.HTTPConnection], str]:
+    parts = urllib.parse.urlsplit(endpoint)
+    if parts.scheme not in ("http", "https") or not parts.netloc:
+        raise ValueError(f"unsupported LibreTranslate endpoint: {endpoint}")
+    # http.client ignores HTTP(S)_PROXY, so proxied endpoints go through urllib with the full URL instead.
+    if urllib.request.getproxies().get(parts.scheme) and not urllib.request.proxy_bypass(parts.hostname or ""):
+        return None, endpoint
+    connection_cls = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+    path = parts.path or "/"
+    if parts.query:
+        path += "?" + parts.query
+    return connection_cls(parts.netloc, timeout=45), path
+
+
+def translate_libre(
+    conn: Optional[http.client.HTTPConnection],
+    path: str,
+    api_key: str,
+    source_locale: str,
+    target_locale: str,
+    texts: List[str],
+) -> List[str]:
+    payload: Dict[str, Any] = {
+        "q": texts[0] if len(texts) == 1 else texts,
         "source": source_locale.split("-")[0].lower(),
         "target": target_locale.split("-")[0].lower(),
         "format": "text",
@@ -53,15 +80,86 @@ def translate_libre(endpoint: str, api_key: str, source_locale: str, target_loca
     if api_key:
         payload["api_key"] = api_key
 
-    data = urllib.parse.urlencode(payload).encode("utf-8")
-    req = urllib.request.Request(endpoint, data=data, headers={"Content-Type": "application/x-www-form-urlencoded"})
-    with urllib.request.urlopen(req, timeout=45) as resp:
-        body = json.loads(resp.read().decode("utf-8"))
+    # Single texts keep the form-encoded request; batches need a JSON body so q can be an array.
+    if len(texts) == 1:
+        data = urllib.parse.urlencode(payload).encode("utf-8")
+        content_type = "application/x-www-form-urlencoded"
+    else:
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        content_type = "application/json"
+    if conn is None:
+        req = urllib.request.Request(path, data=data, headers={"Content-Type": content_type})
+        with urllib.request.urlopen(req, timeout=45) as proxied_resp:
+            raw = proxied_resp.read()
+        return parse_libre_response(raw, len(texts))
+
+    headers = {"Content-Type": content_type, "Connection": "keep-alive"}
+    # The connection is reused across calls; retry once if the server dropped an idle socket.
+    for attempt in range(2):
+        try:
+            conn.request("POST", path, body=data, headers=headers)
+            resp = conn.getresponse()
+            raw = resp.read()
+            break
+        except (http.client.RemoteDisconnected, http.client.CannotSendRequest, ConnectionResetError, BrokenPipeError):
+            conn.close()
+            if attempt:
+                raise
+    if 300 <= resp.status < 400:
+        location = resp.getheader("Location", "")
+        raise RuntimeError(f"HTTP {resp.status} redirect to {location}; pass that URL as --libre-endpoint")
+    if resp.status >= 400:
+        raise RuntimeError(f"HTTP Error {resp.status}: {resp.reason}")
+    return parse_libre_response(raw, len(texts))
+
+
+def parse_libre_response(raw: bytes, expected: int) -> List[str]:
+    body = json.loads(raw.decode("utf-8"))
 
     translated = body.get("translatedText")
-    if not isinstance(translated, str) or not translated.strip():
+    if isinstance(translated, str):
+        translated = [translated]
+    if not isinstance(translated, list) or len(translated) != expected:
         raise RuntimeError("libretranslate response missing translatedText")
-    return translated.strip()
+    results: List[str] = []
+    for value in translated:
+        if not isinstance(value, str) or not value.strip():
+            raise RuntimeError("libretranslate response missing translatedText")
+        results.append(value.strip())
+    return results
+
+
+def run_translation_job(
+    args: argparse.Namespace,
+    source_locale: str,
+    libre_conns: "queue.Queue[Optional[http.client.HTTPConnection]]",
+    libre_path: str,
+    job: Tuple[int, List[Tuple[str, str, str]], str],
+) -> Tuple[Optional[List[str]], str]:
+    _, batch, target_locale = job
+    texts = [source_text for _, _, source_text in batch]
+    try:
+        if args.provider == "mock":
+            translated = texts
+        elif args.provider == "command":
+            translated = [
+                translate_command(args.command_template or "", source_locale, target_locale, source_text, entry_id)
+                for entry_id, _, source_text in batch
+            ]
+        else:
+            # Each worker borrows its own connection; http.client connections are not thread-safe.
+            conn = libre_conns.get()
+            try:
+                translated = translate_libre(conn, libre_path, args.libre_api_key, source_locale, target_locale, texts)
+            finally:
+                libre_conns.put(conn)
+    except Exception as exc:
+        entry_ids = ",".join(entry_id for entry_id, _, _ in batch)
+        return None, f"entry={entry_ids} locale={target_locale} translation failed: {exc}"
+
+    if args.sleep_ms > 0:
+        time.sleep(args.sleep_ms / 1000.0)
+    return translated, ""
 
 
 def main() -> int:
@@ -70,9 +168,26 @@ def main() -> int:
     parser.add_argument("--output", required=True, help="Output JSON path")
     parser.add_argument("--provider", choices=["mock", "command", "libretranslate"], default="mock")
     parser.add_argument("--command-template", help="Command template for provider=command")
-    parser.add_argument("--libre-endpoint", default="http://localhost:5000/translate", help="LibreTranslate endpoint")
+    parser.add_argument("--libre-endpoint", default="http://localhost:5000/translate", help="LibreTranslate endpoint; HTTP(S)_PROXY is honored, redirects are not followed so pass the final URL")
     parser.add_argument("--libre-api-key", default="", help="Optional LibreTranslate API key")
     parser.add_argument("--sleep-ms", type=int, default=0, help="Optional delay between requests")
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=1,
+        help="Entries sent per LibreTranslate request for each locale (provider=libretranslate only)",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        help="Translation requests in flight at once (1 = sequential)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Translate every entry even when another entry has the same source text",
+    )
     args = parser.parse_args()
 
     try:
@@ -88,6 +203,18 @@ def main() -> int:
     if args.provider == "command" and not args.command_template:
         print("ERROR: --command-template is required for provider=command")
         return 2
+    try:
+        template_fields = [name for _, name, _, _ in string.Formatter().parse(args.command_template or "") if name]
+    except ValueError as exc:
+        print(f"ERROR: invalid --command-template: {exc}")
+        return 2
+
+    if args.batch_size < 1:
+        print("ERROR: --batch-size must be >= 1")
+        return 2
+    if args.concurrency < 1:
+        print("ERROR: --concurrency must be >= 1")
+        return 2
 
     if not isinstance(target_locales, list) or not target_locales:
         print("ERROR: target_locales must be a non-empty list")
@@ -96,6 +223,17 @@ def main() -> int:
         print("ERROR: entries must be a non-empty list")
         return 2
 
+    libre_conns: "queue.Queue[Optional[http.client.HTTPConnection]]" = queue.Queue()
+    libre_path = ""
+    if args.provider == "libretranslate":
+        try:
+            for _ in range(args.concurrency):
+                libre_conn, libre_path = open_libre_connection(args.libre_endpoint)
+                libre_conns.put(libre_conn)
+        except ValueError as exc:
+            print(f"ERROR: {exc}")
+            return 2
+
     output: Dict[str, Any] = {
         "source_locale": source_locale,
         "target_locales": target_locales,
@@ -103,39 +241,70 @@ def main() -> int:
         "entries": [],
     }
 
+    pending: List[Tuple[str, str, str]] = []
     for entry in entries:
         entry_id = str(entry.get("id", ""))
         field = str(entry.get("field", ""))
         source_text = str(entry.get("text", ""))
-        if not source_text:
-            continue
+        if source_text:
+            pending.append((entry_id, field, source_text))
 
-        translations: Dict[str, str] = {}
+    # Entries sharing a source text are translated once per locale. Command templates that
+    # reference {id} may produce per-entry output, so they are never deduplicated.
+    uses_id = args.provider == "command" and any(re.match(r"id\b", name) for name in template_fields)
+    unique = pending
+    slots = list(range(len(pending)))
+    if not args.no_cache and not uses_id:
+        first_seen: Dict[str, int] = {}
+        unique = []
+        slots = []
+        for item in pending:
+            slot = first_seen.get(item[2])
+            if slot is None:
+                slot = first_seen[item[2]] = len(unique)
+                unique.append(item)
+            slots.append(slot)
 
-        for target_locale in target_locales:
-            target_locale = str(target_locale)
-            try:
-                if args.provider == "mock":
-                    translated = source_text
-                elif args.provider == "command":
-                    translated = translate_command(args.command_template or "", source_locale, target_locale, source_text, entry_id)
-                else:
-                    translated = translate_libre(args.libre_endpoint, args.libre_api_key, source_locale, target_locale, source_text)
-            except Exception as exc:
-                print(f"ERROR: entry={entry_id} locale={target_locale} translation failed: {exc}")
-                return 1
+    batch_size = args.batch_size if args.provider == "libretranslate" else 1
+    jobs = [
+        (start, unique[start : start + batch_size], str(target_locale))
+        for start in range(0, len(unique), batch_size)
+        for target_locale in target_locales
+    ]
+    run_job = partial(run_translation_job, args, source_locale, libre_conns, libre_path)
+
+    executor = None
+    if args.concurrency > 1 and len(jobs) > 1:
+        executor = ThreadPoolExecutor(max_workers=args.concurrency)
+        results = executor.map(run_job, jobs)
+    else:
+        results = map(run_job, jobs)
 
-            translations[target_locale] = translated
+    # Results come back in job order, so each entry's locales keep the target_locales order.
+    entry_translations: List[Dict[str, str]] = [{} for _ in unique]
+    for (start, _, target_locale), (translated, error) in zip(jobs, results):
+        if translated is None:
+            print(f"ERROR: {error}")
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+            return 1
+        for offset, value in enumerate(translated):
+            entry_translations[start + offset][target_locale] = value
 
-            if args.sleep_ms > 0:
-                time.sleep(args.sleep_ms / 1000.0)
+    if executor is not None:
+        executor.shutdown()
+    while not libre_conns.empty():
+        libre_conn = libre_conns.get()
+        if libre_conn is not None:
+            libre_conn.close()
 
+    for (entry_id, field, source_text), slot in zip(pending, slots):
         output["entries"].append(
             {
                 "id": entry_id,
                 "field": field,
                 "source_text": source_text,
-                "translations": translations,
+                "translations": entry_translations[slot],
             }
         )
 
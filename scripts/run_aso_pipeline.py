@@ -14,13 +14,31 @@ from __future__ import annotations
 
 import argparse
 import csv
+import heapq
 import json
+import os
+import re
+import shlex
 import shutil
 import subprocess
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+from itertools import dropwhile, islice
+from operator import itemgetter
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+QA_SUMMARY_KEY_RE = re.compile(r'"summary"\s*:\s*')
+# Optional keyword signal CSVs, as (estimator flag, pipeline arg name).
+KEYWORD_SIGNAL_ARGS = [
+    ("--apple-proxy", "apple_proxy"),
+    ("--google-planner", "google_planner"),
+    ("--apptweak", "apptweak"),
+    ("--competitor-terms", "competitor_terms"),
+    ("--itunes-signals", "itunes_signals"),
+]
 
 
 def utc_now() -> str:
@@ -31,16 +49,173 @@ def run_cmd(cmd: List[str], workdir: Optional[Path] = None) -> subprocess.Comple
     return subprocess.run(cmd, cwd=str(workdir) if workdir else None, text=True, capture_output=True)
 
 
+def run_cmd_streaming(cmd: List[str], workdir: Optional[Path] = None) -> subprocess.CompletedProcess:
+    # Echo output while the command runs and still capture all of it for the run log.
+    def pump(pipe: Any, chunks: List[str]) -> None:
+        for line in pipe:
+            sys.stdout.write(line)
+            sys.stdout.flush()
+            chunks.append(line)
+
+    out_chunks: List[str] = []
+    err_chunks: List[str] = []
+    with subprocess.Popen(
+        cmd,
+        cwd=str(workdir) if workdir else None,
+        # Python children block-buffer a piped stdout, which would hold output back until exit.
+        env={**os.environ, "PYTHONUNBUFFERED": "1"},
+        text=True,
+        bufsize=1,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    ) as proc:
+        err_thread = threading.Thread(target=pump, args=(proc.stderr, err_chunks))
+        err_thread.start()
+        pump(proc.stdout, out_chunks)
+        err_thread.join()
+        returncode = proc.wait()
+    return subprocess.CompletedProcess(cmd, returncode, "".join(out_chunks), "".join(err_chunks))
+
+
+def read_answer(prompt: str) -> Optional[str]:
+    try:
+        return input(prompt)
+    except EOFError:
+        return None
+
+
 def prompt_yes_no(message: str, default_no: bool = True) -> bool:
     suffix = " [y/N]: " if default_no else " [Y/n]: "
-    ans = input(message + suffix).strip().lower()
+    ans = read_answer(message + suffix)
+    if ans is None:
+        # Closed stdin (e.g. CI without --auto-approve) can never approve anything.
+        print("")
+        print("No input available (stdin closed); declining. Use --auto-approve for unattended runs.")
+        return False
+    ans = ans.strip().lower()
     if not ans:
         return not default_no
     return ans in {"y", "yes"}
 
 
 def prompt_note(message: str) -> str:
-    return input(message + " ").strip()
+    return (read_answer(message + " ") or "").strip()
+
+
+def print_step_header(step_id: str, title: str, summary: str, cmd: List[str]) -> None:
+    print("")
+    print(f"=== {step_id} | {title} ===")
+    print(summary)
+    print("Command:")
+    print("  " + shlex.join(cmd))
+
+
+def new_step_entry(
+    *,
+    step_id: str,
+    title: str,
+    summary: str,
+    cmd: List[str],
+    approved: bool,
+    user_note: str,
+) -> Dict[str, Any]:
+    return {
+        "step_id": step_id,
+        "title": title,
+        "summary": summary,
+        "command": cmd,
+        "approved": approved,
+        "user_note": user_note,
+        "started_at_utc": utc_now(),
+    }
+
+
+def complete_step_entry(step_entry: Dict[str, Any], res: subprocess.CompletedProcess) -> None:
+    step_entry["return_code"] = res.returncode
+    step_entry["stdout"] = res.stdout
+    step_entry["stderr"] = res.stderr
+    step_entry["status"] = "ok" if res.returncode == 0 else "failed"
+    step_entry["finished_at_utc"] = utc_now()
+
+
+def report_step(step_entry: Dict[str, Any], log: Dict[str, Any], echoed: bool = False) -> bool:
+    log["steps"].append(step_entry)
+
+    if not echoed:
+        if step_entry["stdout"].strip():
+            print(step_entry["stdout"].strip())
+        if step_entry["stderr"].strip():
+            print(step_entry["stderr"].strip())
+
+    if step_entry["return_code"] != 0:
+        print(f"Step failed: {step_entry['step_id']}")
+        return False
+    return True
+
+
+def take_resumed_step(
+    *,
+    step_id: str,
+    title: str,
+    summary: str,
+    cmd: List[str],
+    log: Dict[str, Any],
+    resume_steps: Optional[Dict[str, Dict[str, Any]]],
+) -> bool:
+    if resume_steps is None:
+        return False
+    previous = resume_steps.get(step_id)
+    if previous is None or previous.get("command") != cmd:
+        # A changed command (new inputs, flags or --execute-push) means the old result does not apply.
+        # Once a step actually runs, every later step runs too since it may consume that step's outputs.
+        resume_steps.clear()
+        return False
+    print_step_header(step_id, title, summary, cmd)
+    print("Completed in a previous run; skipping.")
+    log["steps"].append(dict(previous, resumed=True))
+    return True
+
+
+def needs_rebuild(outputs: List[Path], inputs: List[Path]) -> bool:
+    try:
+        oldest_output = min(path.stat().st_mtime for path in outputs)
+        newest_input = max(path.stat().st_mtime for path in inputs)
+    except (OSError, ValueError):
+        # Missing files (or nothing to compare) always mean the step runs.
+        return True
+    return newest_input > oldest_output
+
+
+def take_up_to_date_step(
+    *,
+    step_id: str,
+    title: str,
+    summary: str,
+    cmd: List[str],
+    log: Dict[str, Any],
+    artifacts: Optional[Tuple[List[Path], List[Path]]],
+    completed_steps: Optional[Dict[str, Dict[str, Any]]],
+) -> bool:
+    if artifacts is None:
+        return False
+    # Timestamps alone cannot tell a failed or differently configured run's outputs apart,
+    # so only trust files the previous run log records as written by this exact command.
+    previous = (completed_steps or {}).get(step_id)
+    if previous is None or previous.get("command") != cmd:
+        return False
+    inputs, outputs = artifacts
+    if needs_rebuild(outputs, inputs):
+        return False
+    print_step_header(step_id, title, summary, cmd)
+    print("Outputs are newer than inputs; skipping.")
+    step_entry = new_step_entry(step_id=step_id, title=title, summary=summary, cmd=cmd, approved=True, user_note="")
+    step_entry["finished_at_utc"] = step_entry["started_at_utc"]
+    step_entry["status"] = "skipped_up_to_date"
+    step_entry["return_code"] = 0
+    step_entry["stdout"] = ""
+    step_entry["stderr"] = ""
+    log["steps"].append(step_entry)
+    return True
 
 
 def gate_step(
@@ -52,12 +227,26 @@ def gate_step(
     log: Dict[str, Any],
     auto_approve: bool,
     workdir: Optional[Path] = None,
+    resume_steps: Optional[Dict[str, Dict[str, Any]]] = None,
+    checkpoint_path: Optional[Path] = None,
+    artifacts: Optional[Tuple[List[Path], List[Path]]] = None,
+    completed_steps: Optional[Dict[str, Dict[str, Any]]] = None,
+    stream_output: bool = False,
 ) -> bool:
-    print("")
-    print(f"=== {step_id} | {title} ===")
-    print(summary)
-    print("Command:")
-    print("  " + " ".join(cmd))
+    if take_resumed_step(step_id=step_id, title=title, summary=summary, cmd=cmd, log=log, resume_steps=resume_steps):
+        return True
+    if take_up_to_date_step(
+        step_id=step_id,
+        title=title,
+        summary=summary,
+        cmd=cmd,
+        log=log,
+        artifacts=artifacts,
+        completed_steps=completed_steps,
+    ):
+        return True
+
+    print_step_header(step_id, title, summary, cmd)
 
     user_note = ""
     approved = True
@@ -65,15 +254,14 @@ def gate_step(
         approved = prompt_yes_no("Continue with this step?")
         user_note = prompt_note("Any additions/changes before running this step? (empty to skip)")
 
-    step_entry: Dict[str, Any] = {
-        "step_id": step_id,
-        "title": title,
-        "summary": summary,
-        "command": cmd,
-        "approved": approved,
-        "user_note": user_note,
-        "started_at_utc": utc_now(),
-    }
+    step_entry = new_step_entry(
+        step_id=step_id,
+        title=title,
+        summary=summary,
+        cmd=cmd,
+        approved=approved,
+        user_note=user_note,
+    )
 
     if not approved:
         step_entry["status"] = "stopped_by_user"
@@ -82,23 +270,97 @@ def gate_step(
         print("Stopped by user.")
         return False
 
-    res = run_cmd(cmd, workdir=workdir)
-    step_entry["return_code"] = res.returncode
-    step_entry["stdout"] = res.stdout
-    step_entry["stderr"] = res.stderr
-    step_entry["status"] = "ok" if res.returncode == 0 else "failed"
-    step_entry["finished_at_utc"] = utc_now()
-    log["steps"].append(step_entry)
+    if stream_output:
+        complete_step_entry(step_entry, run_cmd_streaming(cmd, workdir=workdir))
+    else:
+        complete_step_entry(step_entry, run_cmd(cmd, workdir=workdir))
+    step_ok = report_step(step_entry, log, echoed=stream_output)
+    if step_ok and checkpoint_path is not None:
+        write_json_atomic(checkpoint_path, log)
+    return step_ok
 
-    if res.stdout.strip():
-        print(res.stdout.strip())
-    if res.stderr.strip():
-        print(res.stderr.strip())
 
-    if res.returncode != 0:
-        print(f"Step failed: {step_id}")
-        return False
-    return True
+def run_step_branch(branch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    # Steps in one branch depend on each other, so stop at the first failure.
+    entries: List[Dict[str, Any]] = []
+    for spec in branch:
+        step_entry = new_step_entry(approved=True, user_note="", **spec)
+        complete_step_entry(step_entry, run_cmd(spec["cmd"]))
+        entries.append(step_entry)
+        if step_entry["return_code"] != 0:
+            break
+    return entries
+
+
+def run_step_branches(
+    branches: List[List[Dict[str, Any]]],
+    *,
+    log: Dict[str, Any],
+    auto_approve: bool,
+    parallel: bool,
+    resume_steps: Optional[Dict[str, Dict[str, Any]]] = None,
+    checkpoint_path: Optional[Path] = None,
+    step_artifacts: Optional[Dict[str, Tuple[List[Path], List[Path]]]] = None,
+    completed_steps: Optional[Dict[str, Dict[str, Any]]] = None,
+    stream_output: bool = False,
+) -> bool:
+    step_artifacts = step_artifacts or {}
+    # Approval prompts cannot interleave, so branches only overlap when every step is auto-approved.
+    if not (parallel and auto_approve and len(branches) > 1):
+        for branch in branches:
+            for spec in branch:
+                step_ok = gate_step(
+                    log=log,
+                    auto_approve=auto_approve,
+                    resume_steps=resume_steps,
+                    checkpoint_path=checkpoint_path,
+                    artifacts=step_artifacts.get(spec["step_id"]),
+                    completed_steps=completed_steps,
+                    stream_output=stream_output,
+                    **spec,
+                )
+                if not step_ok:
+                    return False
+        return True
+
+    # Skipped steps are held per branch so the log keeps step order once the run results are merged in.
+    skipped_entries: List[List[Dict[str, Any]]] = []
+    pending_branches: List[List[Dict[str, Any]]] = []
+    for branch in branches:
+        branch_log: Dict[str, Any] = {"steps": []}
+        # Freshness is only known up front, so a branch runs in full from its first stale step.
+        remaining = list(
+            dropwhile(
+                lambda spec: take_resumed_step(log=branch_log, resume_steps=resume_steps, **spec)
+                or take_up_to_date_step(
+                    log=branch_log,
+                    artifacts=step_artifacts.get(spec["step_id"]),
+                    completed_steps=completed_steps,
+                    **spec,
+                ),
+                branch,
+            )
+        )
+        skipped_entries.append(branch_log["steps"])
+        pending_branches.append(remaining)
+    running = sum(1 for remaining in pending_branches if remaining)
+    if not running:
+        for skipped in skipped_entries:
+            log["steps"].extend(skipped)
+        return True
+
+    with ThreadPoolExecutor(max_workers=running) as executor:
+        results = list(executor.map(run_step_branch, pending_branches))
+
+    all_ok = True
+    for skipped, entries in zip(skipped_entries, results):
+        log["steps"].extend(skipped)
+        for step_entry in entries:
+            print_step_header(step_entry["step_id"], step_entry["title"], step_entry["summary"], step_entry["command"])
+            all_ok = report_step(step_entry, log) and all_ok
+    if all_ok and checkpoint_path is not None:
+        write_json_atomic(checkpoint_path, log)
+    return all_ok
 
 
 def log_decision_step(
@@ -110,6 +372,8 @@ def log_decision_step(
     log: Dict[str, Any],
     user_note: str = "",
 ) -> None:
+    # A decision runs no command, so it starts and finishes at the same instant.
+    now = utc_now()
     step_entry: Dict[str, Any] = {
         "step_id": step_id,
         "title": title,
@@ -117,8 +381,8 @@ def log_decision_step(
         "command": [],
         "approved": approved,
         "user_note": user_note,
-        "started_at_utc": utc_now(),
-        "finished_at_utc": utc_now(),
+        "started_at_utc": now,
+        "finished_at_utc": now,
         "status": "ok" if approved else "stopped_by_user",
         "return_code": 0 if approved else 1,
         "stdout": "",
@@ -162,18 +426,14 @@ def parse_csv_list(raw: str) -> List[str]:
 
 
 def safe_json_load(path: Path) -> Dict[str, Any]:
-    with path.open("r", encoding="utf-8-sig") as f:
-        data = json.load(f)
+    # json.loads takes the raw bytes and skips a UTF-8 BOM itself.
+    data = json.loads(path.read_bytes())
     if not isinstance(data, dict):
         return {}
     return data
 
 
-def print_variant_preview(metadata_bundle: Path, max_locales: int = 5) -> None:
-    if not metadata_bundle.exists():
-        print(f"Variant preview unavailable: missing {metadata_bundle}")
-        return
-    payload = safe_json_load(metadata_bundle)
+def print_variant_preview(payload: Dict[str, Any], max_locales: int = 5) -> None:
     locales = payload.get("locales", [])
     if not isinstance(locales, list) or not locales:
         print("Variant preview unavailable: metadata bundle has no locales.")
@@ -196,36 +456,40 @@ def print_variant_preview(metadata_bundle: Path, max_locales: int = 5) -> None:
     print("=== End Variant Preview ===")
 
 
-def build_translation_batch_from_bundle(
-    *,
-    metadata_bundle: Path,
-    platform: str,
-    source_locale: str,
-    output_path: Path,
-) -> bool:
-    payload = safe_json_load(metadata_bundle)
+def index_bundle_locales(payload: Dict[str, Any], platforms: List[str]) -> Dict[str, Dict[str, Dict[str, str]]]:
+    # One pass over the bundle locales fills {platform: {locale: {field: value}}} for every platform.
+    index: Dict[str, Dict[str, Dict[str, str]]] = {platform: {} for platform in platforms}
     locales = payload.get("locales", [])
     if not isinstance(locales, list) or len(locales) < 2:
-        return False
+        return index
 
-    rows: Dict[str, Dict[str, str]] = {}
-    locale_values: Dict[str, Dict[str, str]] = {}
     for item in locales:
         if not isinstance(item, dict):
             continue
         locale = str(item.get("locale", "")).strip()
         if not locale:
             continue
-        block = item.get(platform, {})
-        if not isinstance(block, dict):
-            continue
-        normalized: Dict[str, str] = {}
-        for field, value in block.items():
-            if isinstance(value, str):
-                normalized[str(field)] = value.strip()
-        if normalized:
-            locale_values[locale] = normalized
+        for platform, locale_values in index.items():
+            block = item.get(platform, {})
+            if not isinstance(block, dict):
+                continue
+            normalized: Dict[str, str] = {}
+            for field, value in block.items():
+                if isinstance(value, str):
+                    normalized[str(field)] = value.strip()
+            if normalized:
+                locale_values[locale] = normalized
+    return index
+
 
+def build_translation_batch_from_bundle(
+    *,
+    payload: Dict[str, Any],
+    locale_values: Dict[str, Dict[str, str]],
+    platform: str,
+    source_locale: str,
+    output_path: Path,
+) -> bool:
     if source_locale not in locale_values:
         source_locale = sorted(locale_values.keys())[0] if locale_values else ""
     if not source_locale:
@@ -235,14 +499,13 @@ def build_translation_batch_from_bundle(
     if not target_locales:
         return False
 
-    source_fields = locale_values.get(source_locale, {})
+    source_fields = locale_values[source_locale]
+    target_fields = [(loc, locale_values[loc]) for loc in target_locales]
     entries: List[Dict[str, Any]] = []
     for field, source_text in source_fields.items():
         if not source_text:
             continue
-        translations: Dict[str, str] = {}
-        for loc in target_locales:
-            translations[loc] = locale_values.get(loc, {}).get(field, "")
+        translations = {loc: fields.get(field, "") for loc, fields in target_fields}
         entries.append(
             {
                 "id": f"{platform}_{field}",
@@ -280,26 +543,70 @@ def apply_generated_fastlane_metadata(generated_root: Path, target_root: Path) -
             shutil.copy2(child, dest)
 
 
-def git_has_changes(repo_dir: Path) -> bool:
-    res = run_cmd(["git", "-C", str(repo_dir), "status", "--porcelain"])
-    return res.returncode == 0 and bool(res.stdout.strip())
+def git_has_staged_changes(repo_dir: Path) -> bool:
+    # Exit code 1 means the index differs from HEAD; unlike status, this skips the worktree scan.
+    res = run_cmd(["git", "-C", str(repo_dir), "diff", "--cached", "--quiet"])
+    return res.returncode == 1
 
 
 def write_json(path: Path, payload: Dict[str, Any]) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8") as f:
-        json.dump(payload, f, ensure_ascii=False, indent=2)
-        f.write("\n")
+    # One dumps+write is faster than json.dump feeding the file chunk by chunk.
+    path.write_text(json.dumps(payload, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
 
 
-def read_csv_rows(path: Path) -> List[Dict[str, str]]:
-    if not path.exists():
-        return []
-    with path.open("r", encoding="utf-8-sig", newline="") as f:
-        return list(csv.DictReader(f))
+def write_json_atomic(path: Path, payload: Dict[str, Any]) -> None:
+    # Write a sibling temp file and swap it in, so an interrupted run never leaves a truncated checkpoint.
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    os.replace(tmp_path, path)
 
 
-def write_human_summary(path: Path, log: Dict[str, Any], output_dir: Path) -> None:
+def read_qa_summary(path: Path) -> Any:
+    # The audit writes "summary" ahead of the large locale_report, so decode it from the head of the file.
+    with path.open("rb") as f:
+        head = f.read(4096).decode("utf-8-sig", errors="ignore")
+    match = QA_SUMMARY_KEY_RE.search(head)
+    if match:
+        try:
+            summary, _ = json.JSONDecoder().raw_decode(head, match.end())
+        except ValueError:
+            summary = None
+        if isinstance(summary, dict) and "warnings" in summary and "errors" in summary:
+            return summary
+    return json.loads(path.read_bytes()).get("summary", {})
+
+
+def row_prevalence(row: Tuple[Optional[str], ...]) -> float:
+    # Semantic theme rows are projected as (theme, prevalence, top_terms).
+    try:
+        return float(str(row[1] or "0"))
+    except ValueError:
+        return 0.0
+
+
+def iter_csv_projected(path: Path, columns: List[str]) -> Iterator[Tuple[Optional[str], ...]]:
+    # Keep only the requested columns. Like csv.DictReader with .get(col, ""), a missing
+    # header reads as "", a short row as None, and duplicate headers resolve to the last one.
+    # Rows are yielded lazily so callers that need only the first few stop reading early.
+    if not path.exists():
+        return
+    with path.open("r", encoding="utf-8-sig", newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return
+        index = {name: idx for idx, name in enumerate(header)}
+        positions = [index.get(column, -1) for column in columns]
+        for row in reader:
+            if not row:
+                continue
+            width = len(row)
+            yield tuple("" if pos < 0 else (row[pos] if pos < width else None) for pos in positions)
+
+
+def write_human_summary(path: Path, log: Dict[str, Any], output_dir: Path) -> str:
     steps = log.get("steps", [])
     status = str(log.get("status", "unknown"))
     analysis_dir = output_dir / "analysis"
@@ -329,62 +636,30 @@ def write_human_summary(path: Path, log: Dict[str, Any], output_dir: Path) -> No
         lines.append(f"- `{s.get('step_id','')}` `{s.get('status','')}` rc=`{rc}` {s.get('title','')}")
 
     keyword_csv = analysis_dir / "keyword_volume_estimates.csv"
-    keyword_rows = read_csv_rows(keyword_csv)
+    keyword_rows = list(islice(iter_csv_projected(keyword_csv, ["keyword", "estimated_demand_score", "confidence_band"]), 3))
     if keyword_rows:
         lines.extend(["", "## Key Findings", "Top keyword opportunities:"])
-        top = keyword_rows[:3]
-        for row in top:
-            lines.append(
-                f"- `{row.get('keyword','')}` demand=`{row.get('estimated_demand_score','')}` confidence=`{row.get('confidence_band','')}`"
-            )
+        for keyword, demand, confidence in keyword_rows:
+            lines.append(f"- `{keyword}` demand=`{demand}` confidence=`{confidence}`")
 
-    ios_patterns = analysis_dir / "ios_competitor_common_patterns.csv"
-    ios_rows = read_csv_rows(ios_patterns)
-    if ios_rows:
-        common = [r for r in ios_rows if str(r.get("is_common", "0")).strip() == "1"][:5]
-        if common:
-            lines.append("Common iOS competitor motifs:")
-            for row in common:
-                lines.append(f"- `{row.get('motif','')}` prevalence=`{row.get('prevalence','')}`")
-    ios_semantics = analysis_dir / "ios_competitor_semantic_themes.csv"
-    ios_semantic_rows = read_csv_rows(ios_semantics)
-    if ios_semantic_rows:
-        top_semantic = sorted(
-            ios_semantic_rows,
-            key=lambda r: float(str(r.get("prevalence", "0") or "0")),
-            reverse=True,
-        )[:5]
-        top_semantic = [r for r in top_semantic if float(str(r.get("prevalence", "0") or "0")) > 0]
-        if top_semantic:
-            lines.append("Top iOS semantic themes:")
-            for row in top_semantic:
-                lines.append(
-                    f"- `{row.get('theme','')}` prevalence=`{row.get('prevalence','')}` top_terms=`{row.get('top_terms','')}`"
-                )
-
-    play_patterns = analysis_dir / "play_competitor_common_patterns.csv"
-    play_rows = read_csv_rows(play_patterns)
-    if play_rows:
-        common = [r for r in play_rows if str(r.get("is_common", "0")).strip() == "1"][:5]
+    for prefix, label in [("ios", "iOS"), ("play", "Android")]:
+        pattern_rows = iter_csv_projected(
+            analysis_dir / f"{prefix}_competitor_common_patterns.csv", ["is_common", "motif", "prevalence"]
+        )
+        common = list(islice((r for r in pattern_rows if str(r[0]).strip() == "1"), 5))
         if common:
-            lines.append("Common Android competitor motifs:")
-            for row in common:
-                lines.append(f"- `{row.get('motif','')}` prevalence=`{row.get('prevalence','')}`")
-    play_semantics = analysis_dir / "play_competitor_semantic_themes.csv"
-    play_semantic_rows = read_csv_rows(play_semantics)
-    if play_semantic_rows:
-        top_semantic = sorted(
-            play_semantic_rows,
-            key=lambda r: float(str(r.get("prevalence", "0") or "0")),
-            reverse=True,
-        )[:5]
-        top_semantic = [r for r in top_semantic if float(str(r.get("prevalence", "0") or "0")) > 0]
+            lines.append(f"Common {label} competitor motifs:")
+            for _, motif, prevalence in common:
+                lines.append(f"- `{motif}` prevalence=`{prevalence}`")
+        semantic_rows = iter_csv_projected(
+            analysis_dir / f"{prefix}_competitor_semantic_themes.csv", ["theme", "prevalence", "top_terms"]
+        )
+        scored = ((row_prevalence(r), r) for r in semantic_rows)
+        top_semantic = [r for value, r in heapq.nlargest(5, scored, key=itemgetter(0)) if value > 0]
         if top_semantic:
-            lines.append("Top Android semantic themes:")
-            for row in top_semantic:
-                lines.append(
-                    f"- `{row.get('theme','')}` prevalence=`{row.get('prevalence','')}` top_terms=`{row.get('top_terms','')}`"
-                )
+            lines.append(f"Top {label} semantic themes:")
+            for theme, prevalence, top_terms in top_semantic:
+                lines.append(f"- `{theme}` prevalence=`{prevalence}` top_terms=`{top_terms}`")
 
     gap_report = analysis_dir / "app_competitor_gap_report.md"
     if gap_report.exists():
@@ -394,8 +669,7 @@ def write_human_summary(path: Path, log: Dict[str, Any], output_dir: Path) -> No
         qa_path = analysis_dir / qa_name
         if qa_path.exists():
             try:
-                qa_payload = json.loads(qa_path.read_text(encoding="utf-8-sig"))
-                summary = qa_payload.get("summary", {})
+                summary = read_qa_summary(qa_path)
                 warnings = int(summary.get("warnings", 0))
                 errors = int(summary.get("errors", 0))
                 lines.append(f"{qa_name}: warnings=`{warnings}` errors=`{errors}`")
@@ -439,21 +713,20 @@ def write_human_summary(path: Path, log: Dict[str, Any], output_dir: Path) -> No
         ]
     )
 
+    text = "\n".join(lines) + "\n"
     path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    path.write_text(text, encoding="utf-8")
+    return text
 
 
 def finalize_run(log: Dict[str, Any], *, status: str, log_path: Path, summary_path: Path, output_dir: Path) -> None:
     log["finished_at_utc"] = utc_now()
     log["status"] = status
     write_json(log_path, log)
-    write_human_summary(summary_path, log, output_dir)
+    summary_text = write_human_summary(summary_path, log, output_dir)
     print("")
     print("=== Human Summary ===")
-    try:
-        print(summary_path.read_text(encoding="utf-8").rstrip())
-    except Exception as exc:
-        print(f"Could not read human summary file: {exc}")
+    print(summary_text.rstrip())
     print("=== End Human Summary ===")
 
 
@@ -478,7 +751,35 @@ def main() -> int:
     parser.add_argument("--push-android", action="store_true", help="Include Android fastlane push step")
     parser.add_argument("--execute-push", action="store_true", help="Actually execute fastlane push commands")
     parser.add_argument("--auto-approve", action="store_true", help="Skip interactive approval prompts")
+    parser.add_argument(
+        "--parallel-analysis",
+        action="store_true",
+        help="Run independent analysis steps (A1, A2, A3+A4) concurrently; requires --auto-approve",
+    )
+    parser.add_argument(
+        "--parallel-push",
+        action="store_true",
+        help="Run the iOS and Android push steps (S3, S4) concurrently; requires --auto-approve",
+    )
+    parser.add_argument(
+        "--stream-output",
+        action="store_true",
+        help="Print step output live while it runs (parallel analysis branches are still printed at the end)",
+    )
     parser.add_argument("--log-out", help="Optional path for pipeline run log JSON")
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help=(
+            "Rerun the same command to skip leading steps that completed with identical commands "
+            "in the existing run log; approvals are asked again"
+        ),
+    )
+    parser.add_argument(
+        "--skip-up-to-date",
+        action="store_true",
+        help="Skip analysis and metadata generation steps whose outputs are newer than their input files and that the existing run log records as completed with the same command",
+    )
     parser.add_argument("--human-summary-out", help="Optional path for human-readable Markdown summary")
     parser.add_argument("--current-metadata-root", help="Current app fastlane metadata root for competitor gap analysis")
     parser.add_argument("--compare-locales", default="en-US", help="Comma-separated locales for app-vs-competitor comparison")
@@ -498,6 +799,7 @@ def main() -> int:
 
     script_dir = Path(__file__).resolve().parent
     output_dir = Path(args.output_dir).resolve()
+    metadata_input = str(Path(args.metadata_input).resolve())
     output_dir.mkdir(parents=True, exist_ok=True)
 
     log_path = Path(args.log_out).resolve() if args.log_out else output_dir / "pipeline_run_log.json"
@@ -506,14 +808,32 @@ def main() -> int:
         if args.human_summary_out
         else output_dir / "pipeline_human_summary.md"
     )
+    # Steps that finished in the previous run, keyed by step id, for --resume and --skip-up-to-date.
+    completed_steps: Dict[str, Dict[str, Any]] = {}
+    if (args.resume or args.skip_up_to_date) and log_path.exists():
+        try:
+            previous_log = safe_json_load(log_path)
+        except Exception as exc:
+            print(f"WARNING: cannot read previous run log {log_path}: {exc}")
+            previous_log = {}
+        previous_steps = previous_log.get("steps", [])
+        for step in previous_steps if isinstance(previous_steps, list) else []:
+            if isinstance(step, dict) and step.get("status") in ("ok", "skipped_up_to_date") and step.get("command"):
+                completed_steps[str(step.get("step_id", ""))] = step
+    resume_steps = dict(completed_steps) if args.resume else {}
+
     log: Dict[str, Any] = {
         "started_at_utc": utc_now(),
         "app_scope": args.app_scope,
-        "metadata_input": str(Path(args.metadata_input).resolve()),
+        "metadata_input": metadata_input,
         "output_dir": str(output_dir),
         "steps": [],
     }
 
+    def fail(return_code: int) -> int:
+        finalize_run(log, status="failed", log_path=log_path, summary_path=human_summary_path, output_dir=output_dir)
+        return return_code
+
     analysis_dir = output_dir / "analysis"
     analysis_dir.mkdir(parents=True, exist_ok=True)
     metadata_bundle = output_dir / "metadata_bundle.json"
@@ -526,14 +846,23 @@ def main() -> int:
     )
     compare_locales = parse_csv_list(args.compare_locales)
 
+    analysis_branches: List[List[Dict[str, Any]]] = []
+    # Input and output files per analysis step, for --skip-up-to-date.
+    step_artifacts: Dict[str, Tuple[List[Path], List[Path]]] = {}
+
     if args.keyword_input:
         keyword_out = analysis_dir / "keyword_volume_estimates.csv"
         keyword_out_json = analysis_dir / "keyword_volume_estimates.json"
+        keyword_script = script_dir / "aso_keyword_volume_estimator.py"
+        keyword_input = Path(args.keyword_input).resolve()
+        signal_inputs = [
+            (flag, Path(getattr(args, name)).resolve()) for flag, name in KEYWORD_SIGNAL_ARGS if getattr(args, name)
+        ]
         cmd = [
             sys.executable,
-            str(script_dir / "aso_keyword_volume_estimator.py"),
+            str(keyword_script),
             "--keywords",
-            str(Path(args.keyword_input).resolve()),
+            str(keyword_input),
             "--app-scope",
             args.app_scope,
             "--output",
@@ -541,28 +870,23 @@ def main() -> int:
             "--output-json",
             str(keyword_out_json),
         ]
-        if args.apple_proxy:
-            cmd += ["--apple-proxy", str(Path(args.apple_proxy).resolve())]
-        if args.google_planner:
-            cmd += ["--google-planner", str(Path(args.google_planner).resolve())]
-        if args.apptweak:
-            cmd += ["--apptweak", str(Path(args.apptweak).resolve())]
-        if args.competitor_terms:
-            cmd += ["--competitor-terms", str(Path(args.competitor_terms).resolve())]
-        if args.itunes_signals:
-            cmd += ["--itunes-signals", str(Path(args.itunes_signals).resolve())]
+        for flag, path in signal_inputs:
+            cmd.extend((flag, str(path)))
+        step_artifacts["A1"] = (
+            [keyword_script, keyword_input] + [path for _, path in signal_inputs],
+            [keyword_out, keyword_out_json],
+        )
 
-        step_ok = gate_step(
-            step_id="A1",
-            title="Keyword Demand Analysis",
-            summary="Analyze keyword demand scores and confidence bands before metadata generation.",
-            cmd=cmd,
-            log=log,
-            auto_approve=args.auto_approve,
+        analysis_branches.append(
+            [
+                {
+                    "step_id": "A1",
+                    "title": "Keyword Demand Analysis",
+                    "summary": "Analyze keyword demand scores and confidence bands before metadata generation.",
+                    "cmd": cmd,
+                }
+            ]
         )
-        if not step_ok:
-            finalize_run(log, status="failed", log_path=log_path, summary_path=human_summary_path, output_dir=output_dir)
-            return 1
 
     if args.ios_seeds:
         ios_cmd = [
@@ -579,42 +903,35 @@ def main() -> int:
             "--prefix",
             "ios_competitor",
         ]
-        step_ok = gate_step(
-            step_id="A2",
-            title="iOS Competitor Analysis",
-            summary="Build iOS competitor matrix and shared pattern report from iTunes data.",
-            cmd=ios_cmd,
-            log=log,
-            auto_approve=args.auto_approve,
+        analysis_branches.append(
+            [
+                {
+                    "step_id": "A2",
+                    "title": "iOS Competitor Analysis",
+                    "summary": "Build iOS competitor matrix and shared pattern report from iTunes data.",
+                    "cmd": ios_cmd,
+                }
+            ]
         )
-        if not step_ok:
-            finalize_run(log, status="failed", log_path=log_path, summary_path=human_summary_path, output_dir=output_dir)
-            return 1
 
     if args.play_raw_export:
         normalized_play = analysis_dir / "play_competitor_normalized.csv"
+        normalize_script = script_dir / "aso_play_export_normalizer.py"
+        play_raw_export = Path(args.play_raw_export).resolve()
+        normalize_inputs = [normalize_script, play_raw_export]
         normalize_cmd = [
             sys.executable,
-            str(script_dir / "aso_play_export_normalizer.py"),
+            str(normalize_script),
             "--input",
-            str(Path(args.play_raw_export).resolve()),
+            str(play_raw_export),
             "--output",
             str(normalized_play),
         ]
         if args.play_mapping_json:
-            normalize_cmd += ["--mapping-json", str(Path(args.play_mapping_json).resolve())]
-
-        step_ok = gate_step(
-            step_id="A3",
-            title="Play Export Normalization",
-            summary="Normalize raw Play export into analyzer-ready schema.",
-            cmd=normalize_cmd,
-            log=log,
-            auto_approve=args.auto_approve,
-        )
-        if not step_ok:
-            finalize_run(log, status="failed", log_path=log_path, summary_path=human_summary_path, output_dir=output_dir)
-            return 1
+            play_mapping_json = Path(args.play_mapping_json).resolve()
+            normalize_inputs.append(play_mapping_json)
+            normalize_cmd += ["--mapping-json", str(play_mapping_json)]
+        step_artifacts["A3"] = (normalize_inputs, [normalized_play])
 
         play_cmd = [
             sys.executable,
@@ -628,26 +945,63 @@ def main() -> int:
             "--prefix",
             "play_competitor",
         ]
-        step_ok = gate_step(
-            step_id="A4",
-            title="Android Competitor Analysis",
-            summary="Build Play competitor matrix and shared pattern report from normalized export.",
-            cmd=play_cmd,
-            log=log,
-            auto_approve=args.auto_approve,
+        step_artifacts["A4"] = (
+            [script_dir / "aso_play_competitor_import_analyzer.py", normalized_play],
+            [
+                analysis_dir / f"play_competitor_{name}"
+                for name in [
+                    "matrix.csv",
+                    "common_patterns.csv",
+                    "term_coverage.csv",
+                    "similarity.csv",
+                    "semantic_themes.csv",
+                    "keyword_emphasis.csv",
+                    "phrase_patterns.csv",
+                    "report.md",
+                ]
+            ],
+        )
+        analysis_branches.append(
+            [
+                {
+                    "step_id": "A3",
+                    "title": "Play Export Normalization",
+                    "summary": "Normalize raw Play export into analyzer-ready schema.",
+                    "cmd": normalize_cmd,
+                },
+                {
+                    "step_id": "A4",
+                    "title": "Android Competitor Analysis",
+                    "summary": "Build Play competitor matrix and shared pattern report from normalized export.",
+                    "cmd": play_cmd,
+                },
+            ]
         )
-        if not step_ok:
-            finalize_run(log, status="failed", log_path=log_path, summary_path=human_summary_path, output_dir=output_dir)
-            return 1
 
-    has_competitor_outputs = any(
-        (analysis_dir / p).exists()
-        for p in [
+    # A1, A2 and the A3->A4 chain read separate inputs and write separate outputs.
+    step_ok = run_step_branches(
+        analysis_branches,
+        log=log,
+        auto_approve=args.auto_approve,
+        parallel=args.parallel_analysis,
+        resume_steps=resume_steps,
+        checkpoint_path=log_path,
+        stream_output=args.stream_output,
+        step_artifacts=step_artifacts if args.skip_up_to_date else None,
+        completed_steps=completed_steps,
+    )
+    if not step_ok:
+        return fail(1)
+
+    with os.scandir(analysis_dir) as entries:
+        analysis_names = {entry.name for entry in entries}
+    has_competitor_outputs = not analysis_names.isdisjoint(
+        {
             "ios_competitor_common_patterns.csv",
             "play_competitor_common_patterns.csv",
             "ios_competitor_semantic_themes.csv",
             "play_competitor_semantic_themes.csv",
-        ]
+        }
     )
     if current_metadata_root and has_competitor_outputs:
         gap_json = analysis_dir / "app_competitor_gap_report.json"
@@ -679,20 +1033,23 @@ def main() -> int:
             cmd=gap_cmd,
             log=log,
             auto_approve=args.auto_approve,
+            resume_steps=resume_steps,
+            checkpoint_path=log_path,
+            stream_output=args.stream_output,
         )
         if not step_ok:
-            finalize_run(log, status="failed", log_path=log_path, summary_path=human_summary_path, output_dir=output_dir)
-            return 1
+            return fail(1)
 
+    generator_script = script_dir / "aso_metadata_generator.py"
     step_ok = gate_step(
         step_id="S1",
         title="Generate Metadata",
         summary="Generate new Apple/Google metadata files and fastlane metadata folders.",
         cmd=[
             sys.executable,
-            str(script_dir / "aso_metadata_generator.py"),
+            str(generator_script),
             "--input",
-            str(Path(args.metadata_input).resolve()),
+            metadata_input,
             "--output-dir",
             str(output_dir),
             "--bundle-out",
@@ -700,21 +1057,35 @@ def main() -> int:
         ],
         log=log,
         auto_approve=args.auto_approve,
+        resume_steps=resume_steps,
+        checkpoint_path=log_path,
+        # The generator writes the bundle last, so it is only newer than the inputs after a full run.
+        artifacts=(
+            ([generator_script, Path(metadata_input)], [metadata_bundle])
+            if args.skip_up_to_date
+            else None
+        ),
+        completed_steps=completed_steps,
+        stream_output=args.stream_output,
     )
     if not step_ok:
-        finalize_run(log, status="failed", log_path=log_path, summary_path=human_summary_path, output_dir=output_dir)
-        return 1
+        return fail(1)
 
+    # Parse the bundle once; both translation batches and the variant preview read it.
+    bundle_payload = safe_json_load(metadata_bundle)
+    bundle_index = index_bundle_locales(bundle_payload, ["apple", "google"])
     apple_batch = analysis_dir / "translation_batch_apple.json"
     google_batch = analysis_dir / "translation_batch_google.json"
     has_apple_translation_batch = build_translation_batch_from_bundle(
-        metadata_bundle=metadata_bundle,
+        payload=bundle_payload,
+        locale_values=bundle_index["apple"],
         platform="apple",
         source_locale=args.localization_source_locale,
         output_path=apple_batch,
     )
     has_google_translation_batch = build_translation_batch_from_bundle(
-        metadata_bundle=metadata_bundle,
+        payload=bundle_payload,
+        locale_values=bundle_index["google"],
         platform="google",
         source_locale=args.localization_source_locale,
         output_path=google_batch,
@@ -741,10 +1112,12 @@ def main() -> int:
             cmd=apple_qa_cmd,
             log=log,
             auto_approve=args.auto_approve,
+            resume_steps=resume_steps,
+            checkpoint_path=log_path,
+            stream_output=args.stream_output,
         )
         if not step_ok:
-            finalize_run(log, status="failed", log_path=log_path, summary_path=human_summary_path, output_dir=output_dir)
-            return 1
+            return fail(1)
 
     if has_google_translation_batch and args.app_scope in {"auto", "android_only", "dual"}:
         google_qa_out = analysis_dir / "translation_qa_google.json"
@@ -767,12 +1140,14 @@ def main() -> int:
             cmd=google_qa_cmd,
             log=log,
             auto_approve=args.auto_approve,
+            resume_steps=resume_steps,
+            checkpoint_path=log_path,
+            stream_output=args.stream_output,
         )
         if not step_ok:
-            finalize_run(log, status="failed", log_path=log_path, summary_path=human_summary_path, output_dir=output_dir)
-            return 1
+            return fail(1)
 
-    print_variant_preview(metadata_bundle)
+    print_variant_preview(bundle_payload)
     accepted = gate_decision(
         step_id="V1",
         title="Variant Acceptance Gate",
@@ -782,8 +1157,7 @@ def main() -> int:
         auto_approve=args.auto_approve,
     )
     if not accepted:
-        finalize_run(log, status="failed", log_path=log_path, summary_path=human_summary_path, output_dir=output_dir)
-        return 1
+        return fail(1)
 
     step_ok = gate_step(
         step_id="S2",
@@ -801,16 +1175,17 @@ def main() -> int:
         ],
         log=log,
         auto_approve=args.auto_approve,
+        resume_steps=resume_steps,
+        checkpoint_path=log_path,
+        stream_output=args.stream_output,
     )
     if not step_ok:
-        finalize_run(log, status="failed", log_path=log_path, summary_path=human_summary_path, output_dir=output_dir)
-        return 1
+        return fail(1)
 
     if args.apply_generated_metadata:
         if not target_metadata_root:
             print("ERROR: --target-metadata-root (or --current-metadata-root) is required when --apply-generated-metadata is set")
-            finalize_run(log, status="failed", log_path=log_path, summary_path=human_summary_path, output_dir=output_dir)
-            return 2
+            return fail(2)
         apply_ok = gate_decision(
             step_id="S2A",
             title="Apply Generated Metadata",
@@ -820,21 +1195,19 @@ def main() -> int:
             auto_approve=args.auto_approve,
         )
         if not apply_ok:
-            finalize_run(log, status="failed", log_path=log_path, summary_path=human_summary_path, output_dir=output_dir)
-            return 1
+            return fail(1)
         try:
             apply_generated_fastlane_metadata(generated_fastlane_metadata, target_metadata_root)
             print(f"Applied metadata to: {target_metadata_root}")
         except Exception as exc:
             print(f"ERROR: failed to apply generated metadata: {exc}")
-            finalize_run(log, status="failed", log_path=log_path, summary_path=human_summary_path, output_dir=output_dir)
-            return 1
+            return fail(1)
 
+    push_branches: List[List[Dict[str, Any]]] = []
     if args.push_ios:
         if not args.app_identifier:
             print("ERROR: --app-identifier is required when --push-ios is set")
-            finalize_run(log, status="failed", log_path=log_path, summary_path=human_summary_path, output_dir=output_dir)
-            return 2
+            return fail(2)
         cmd = [
             sys.executable,
             str(script_dir / "aso_fastlane_bridge.py"),
@@ -851,24 +1224,21 @@ def main() -> int:
         ]
         if args.execute_push:
             cmd.append("--execute")
-
-        step_ok = gate_step(
-            step_id="S3",
-            title="Push iOS Metadata",
-            summary="Push iOS metadata via fastlane deliver (dry-run unless --execute-push).",
-            cmd=cmd,
-            log=log,
-            auto_approve=args.auto_approve,
+        push_branches.append(
+            [
+                {
+                    "step_id": "S3",
+                    "title": "Push iOS Metadata",
+                    "summary": "Push iOS metadata via fastlane deliver (dry-run unless --execute-push).",
+                    "cmd": cmd,
+                }
+            ]
         )
-        if not step_ok:
-            finalize_run(log, status="failed", log_path=log_path, summary_path=human_summary_path, output_dir=output_dir)
-            return 1
 
     if args.push_android:
         if not args.package_name:
             print("ERROR: --package-name is required when --push-android is set")
-            finalize_run(log, status="failed", log_path=log_path, summary_path=human_summary_path, output_dir=output_dir)
-            return 2
+            return fail(2)
         cmd = [
             sys.executable,
             str(script_dir / "aso_fastlane_bridge.py"),
@@ -885,25 +1255,35 @@ def main() -> int:
         ]
         if args.execute_push:
             cmd.append("--execute")
-
-        step_ok = gate_step(
-            step_id="S4",
-            title="Push Android Metadata",
-            summary="Push Android metadata via fastlane supply (dry-run unless --execute-push).",
-            cmd=cmd,
-            log=log,
-            auto_approve=args.auto_approve,
+        push_branches.append(
+            [
+                {
+                    "step_id": "S4",
+                    "title": "Push Android Metadata",
+                    "summary": "Push Android metadata via fastlane supply (dry-run unless --execute-push).",
+                    "cmd": cmd,
+                }
+            ]
         )
-        if not step_ok:
-            finalize_run(log, status="failed", log_path=log_path, summary_path=human_summary_path, output_dir=output_dir)
-            return 1
+
+    # S3 and S4 talk to different stores with different credentials.
+    step_ok = run_step_branches(
+        push_branches,
+        log=log,
+        auto_approve=args.auto_approve,
+        parallel=args.parallel_push,
+        resume_steps=resume_steps,
+        checkpoint_path=log_path,
+        stream_output=args.stream_output,
+    )
+    if not step_ok:
+        return fail(1)
 
     repo_dir = Path(args.git_workdir).resolve()
     if args.git_commit:
         if not repo_dir.exists():
             print(f"ERROR: git workdir not found: {repo_dir}")
-            finalize_run(log, status="failed", log_path=log_path, summary_path=human_summary_path, output_dir=output_dir)
-            return 2
+            return fail(2)
         stage_ok = gate_step(
             step_id="G1",
             title="Git Stage Changes",
@@ -911,12 +1291,14 @@ def main() -> int:
             cmd=["git", "-C", str(repo_dir), "add", "-A"],
             log=log,
             auto_approve=args.auto_approve,
+            resume_steps=resume_steps,
+            checkpoint_path=log_path,
+            stream_output=args.stream_output,
         )
         if not stage_ok:
-            finalize_run(log, status="failed", log_path=log_path, summary_path=human_summary_path, output_dir=output_dir)
-            return 1
+            return fail(1)
 
-        if git_has_changes(repo_dir):
+        if git_has_staged_changes(repo_dir):
             commit_ok = gate_step(
                 step_id="G2",
                 title="Git Commit",
@@ -924,10 +1306,12 @@ def main() -> int:
                 cmd=["git", "-C", str(repo_dir), "commit", "-m", args.git_commit_message],
                 log=log,
                 auto_approve=args.auto_approve,
+                resume_steps=resume_steps,
+                checkpoint_path=log_path,
+                stream_output=args.stream_output,
             )
             if not commit_ok:
-                finalize_run(log, status="failed", log_path=log_path, summary_path=human_summary_path, output_dir=output_dir)
-                return 1
+                return fail(1)
         else:
             log_decision_step(
                 step_id="G2",
@@ -945,8 +1329,7 @@ def main() -> int:
             branch = res.stdout.strip() if res.returncode == 0 else ""
         if not branch:
             print("ERROR: could not determine git branch for push")
-            finalize_run(log, status="failed", log_path=log_path, summary_path=human_summary_path, output_dir=output_dir)
-            return 2
+            return fail(2)
         push_ok = gate_step(
             step_id="G3",
             title="Git Push",
@@ -954,10 +1337,12 @@ def main() -> int:
             cmd=["git", "-C", str(repo_dir), "push", args.git_remote, branch],
             log=log,
             auto_approve=args.auto_approve,
+            resume_steps=resume_steps,
+            checkpoint_path=log_path,
+            stream_output=args.stream_output,
         )
         if not push_ok:
-            finalize_run(log, status="failed", log_path=log_path, summary_path=human_summary_path, output_dir=output_dir)
-            return 1
+            return fail(1)
 
     finalize_run(log, status="ok", log_path=log_path, summary_path=human_summary_path, output_dir=output_dir)
     print(f"Pipeline completed. Log: {log_path}")